@@ -0,0 +1,460 @@
+"""
+Numerical kernels for the hot paths of the SRT analysis GUI.
+
+The kernels are compiled with Numba when it is installed: each one is compiled
+on its first call and the machine code is cached on disk for later runs.
+Without Numba, and in frozen (PyInstaller) builds, the decorators below are
+no-ops and the same code runs as plain NumPy, so the GUI works either way.
+"""
+import sys
+
+import numpy as np
+from scipy.linalg import eigh
+from scipy.spatial.distance import pdist, squareform
+from scipy.special import fdtrc, stdtr
+
+try:
+    # A frozen app has no source files for Numba to key its on-disk cache on, so it
+    # would recompile every kernel on each launch; it runs the NumPy code instead
+    if getattr(sys, "frozen", False):
+        raise ImportError("Numba is not used in frozen builds")
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+
+@njit(cache=True, parallel=True)
+def grouped_ecdfs(rts, starts, grids):
+    """
+    Evaluate the empirical CDF of each group of reaction times on a grid.
+
+    Group i is rts[starts[i]:starts[i + 1]] and is evaluated on grids[i], or on
+    grids[0] when a single grid is shared by all groups. The ECDF is the linear
+    interpolation of the sorted reaction times against k/n, matching np.interp.
+    Empty groups yield NaN rows. Reaction times may be float32 (as stored in
+    the GUI's per-participant cache) or float64; the ECDFs are always float64.
+    """
+    n_groups = starts.shape[0] - 1
+    out = np.empty((n_groups, grids.shape[1]))
+    for i in prange(n_groups):
+        grid = grids[i] if grids.shape[0] > 1 else grids[0]
+        group = np.sort(rts[starts[i]:starts[i + 1]])
+        n = group.shape[0]
+        if n == 0:
+            out[i, :] = np.nan
+        else:
+            out[i, :] = np.interp(grid, group, np.arange(1, n + 1) / n)
+    return out
+
+
+def modality_ecdfs(rts, modalities, groups, n_groups, grids):
+    """
+    Compute per-group ECDFs of the Audio (1), Visual (2) and Audiovisual (3) reaction times.
+
+    Parameters:
+    -----------
+    rts : numpy.ndarray
+        Reaction times of all trials, float32 or (after conversion) float64
+    modalities : numpy.ndarray
+        Modality code of each trial
+    groups : numpy.ndarray
+        Integer group (e.g. participant) index of each trial, in range(n_groups)
+    n_groups : int
+        Number of groups
+    grids : numpy.ndarray
+        (n_groups, n_points) evaluation grids, or (1, n_points) for a shared grid
+
+    Returns:
+    --------
+    tuple
+        (ecdfs, counts) where ecdfs has shape (3, n_groups, n_points) and counts
+        holds the number of trials per modality and group, shape (3, n_groups)
+    """
+    rts = np.asarray(rts)
+    if rts.dtype != np.float32:
+        rts = rts.astype(np.float64, copy=False)
+    groups = np.asarray(groups, dtype=np.int64)
+    grids = np.ascontiguousarray(grids, dtype=np.float64)
+    bounds = np.arange(n_groups + 1)
+    ecdfs = np.empty((3, n_groups, grids.shape[1]))
+    counts = np.empty((3, n_groups), dtype=np.int64)
+    for k, modality in enumerate((1, 2, 3)):
+        mask = modalities == modality
+        mod_groups = groups[mask]
+        order = np.argsort(mod_groups, kind="stable")
+        starts = np.searchsorted(mod_groups[order], bounds).astype(np.int64)
+        ecdfs[k] = grouped_ecdfs(np.ascontiguousarray(rts[mask][order]), starts, grids)
+        counts[k] = np.diff(starts)
+    return ecdfs, counts
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def batched_ttest(groups, counts, left, right):
+    """
+    Independent two-sample t statistics for many pairs of groups at once.
+
+    groups is a padded (n_groups, max_n) array whose row i holds counts[i]
+    values; pair k compares row left[k] with row right[k]. The pooled-variance
+    (Student) statistic matches scipy.stats.ttest_ind, including NaN for pairs
+    with an empty group or no degrees of freedom.
+    """
+    n_tests = left.shape[0]
+    t = np.empty(n_tests)
+    df = np.empty(n_tests)
+    for k in prange(n_tests):
+        n1 = counts[left[k]]
+        n2 = counts[right[k]]
+        df[k] = n1 + n2 - 2
+        if n1 == 0 or n2 == 0 or n1 + n2 < 3:
+            t[k] = np.nan
+            continue
+        a = groups[left[k], :n1]
+        b = groups[right[k], :n2]
+        m1 = a.mean()
+        m2 = b.mean()
+        ss = ((a - m1) ** 2).sum() + ((b - m2) ** 2).sum()
+        t[k] = (m1 - m2) / np.sqrt(ss / df[k] * (1.0 / n1 + 1.0 / n2))
+    return t, df
+
+
+def vectorized_ttest(groups, counts, left, right):
+    """
+    NumPy equivalent of batched_ttest, used when Numba is not installed.
+
+    Group moments are computed for the whole padded array at once and the
+    pairs are then indexed out, so the cost is a handful of array operations
+    rather than a Python loop over pairs. Padding must be zero.
+    """
+    mask = np.arange(groups.shape[1]) < counts[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = groups.sum(axis=1) / counts
+        ss = (np.where(mask, groups - means[:, None], 0.0) ** 2).sum(axis=1)
+        n1 = counts[left]
+        n2 = counts[right]
+        df = (n1 + n2 - 2).astype(np.float64)
+        t = (means[left] - means[right]) / np.sqrt((ss[left] + ss[right]) / df * (1.0 / n1 + 1.0 / n2))
+    t[(n1 == 0) | (n2 == 0) | (df < 1)] = np.nan
+    return t, df
+
+
+def ttest_pairs(samples, pairs):
+    """
+    Run scipy.stats.ttest_ind on each pair of samples in a single batched call.
+
+    Parameters:
+    -----------
+    samples : list
+        1D array-likes of observations
+    pairs : list
+        (i, j) index pairs into samples
+
+    Returns:
+    --------
+    tuple
+        (t, p) arrays with one two-sided result per pair
+    """
+    counts = np.array([len(s) for s in samples], dtype=np.int64)
+    groups = np.zeros((len(samples), max(counts.max(initial=0), 1)))
+    for row, sample in zip(groups, samples):
+        row[:len(sample)] = sample
+    left, right = np.array(pairs, dtype=np.int64).reshape(-1, 2).T.copy()
+    kernel = batched_ttest if HAVE_NUMBA else vectorized_ttest
+    t, df = kernel(groups, counts, left, right)
+    return t, 2 * stdtr(df, -np.abs(t))
+
+
+def _log_g_nodes(lower=-20.0, upper=50.0, panels=140, order=8):
+    """Composite Gauss-Legendre nodes and weights over log(g) on [lower, upper]."""
+    x, w = np.polynomial.legendre.leggauss(order)
+    edges = np.linspace(lower, upper, panels + 1)
+    half = np.diff(edges)[:, None] / 2
+    nodes = (edges[:-1, None] + half * (x + 1)).ravel()
+    return nodes, (half * w).ravel()
+
+
+# Fixed quadrature grid for jzs_bf10; the integrand is negligible outside it
+BF_NODES, BF_WEIGHTS = _log_g_nodes()
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def jzs_bf10(t, n, df, r, nodes, weights):
+    """
+    JZS Bayes factors BF10 (Rouder et al., 2009) for many t statistics at once.
+
+    n and df are the effective sample size and degrees of freedom of each test
+    and r is the Cauchy prior scale. The integral over g is evaluated on the
+    fixed log(g) quadrature grid and accumulated in log space, so large
+    statistics do not underflow. Non-finite t gives NaN.
+    """
+    n_tests = t.shape[0]
+    bf = np.empty(n_tests)
+    for k in prange(n_tests):
+        if not np.isfinite(t[k]):
+            bf[k] = np.nan
+            continue
+        t2 = t[k] * t[k]
+        expo = (df[k] + 1) / 2
+        g = np.exp(nodes)
+        a = 1 + n[k] * g * r * r
+        log_f = (-0.5 * np.log(a) - expo * np.log1p(t2 / (a * df[k]))
+                 - 0.5 * np.log(2 * np.pi) - 0.5 * nodes - 1 / (2 * g))
+        peak = log_f.max()
+        log_integral = peak + np.log((weights * np.exp(log_f - peak)).sum())
+        bf[k] = np.exp(log_integral + expo * np.log1p(t2 / df[k]))
+    return bf
+
+
+def bayes_factors(t, nx, ny, r=0.707):
+    """
+    Two-sided JZS Bayes factors for independent two-sample t-tests.
+
+    Batched equivalent of calling pingouin.bayesfactor_ttest(t[k], nx[k],
+    ny[k], r=r) for every k, including pingouin's one-sample treatment of
+    ny == 1. Returns an array of BF10 values.
+    """
+    t = np.asarray(t, dtype=np.float64).ravel()
+    nx = np.asarray(nx, dtype=np.float64).ravel()
+    ny = np.asarray(ny, dtype=np.float64).ravel()
+    one_sample = ny == 1
+    n = np.where(one_sample, nx, nx * ny / (nx + ny))
+    df = np.where(one_sample, nx - 1, nx + ny - 2)
+    return jzs_bf10(t, n, df, float(r), BF_NODES, BF_WEIGHTS)
+
+
+def bayes_factor_pairs(samples, pairs, t, r=0.707):
+    """
+    BF10 for each pair of samples, given the t statistics from ttest_pairs.
+
+    Returns an array with one Bayes factor per (i, j) pair.
+    """
+    counts = np.array([len(s) for s in samples], dtype=np.int64)
+    left, right = np.array(pairs, dtype=np.int64).reshape(-1, 2).T
+    return bayes_factors(t, counts[left], counts[right], r)
+
+
+def percentile_ranks(values, scores):
+    """
+    Percentile rank of each score within values.
+
+    Matches scipy.stats.percentileofscore(values, score) with the default
+    kind='rank', but uses two binary searches over the sorted values instead
+    of comparing every score with every value. All ranks are NaN when values
+    is empty or contains NaN, and NaN scores get NaN ranks.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    if values.size == 0 or np.isnan(values).any():
+        return np.full(scores.shape, np.nan)
+    ordered = np.sort(values)
+    left = np.searchsorted(ordered, scores, side="left")
+    right = np.searchsorted(ordered, scores, side="right")
+    ranks = (left + right + (left < right)) * (50.0 / values.size)
+    return np.where(np.isnan(scores), np.nan, ranks)
+
+
+def _residual_ss(values, codes):
+    """Sum of squares of values around the means of the cells given by codes."""
+    counts = np.bincount(codes)
+    sums = np.bincount(codes, weights=values)
+    filled = counts > 0
+    return (values ** 2).sum() - (sums[filled] ** 2 / counts[filled]).sum()
+
+
+def _additive_residual_ss(values, codes1, codes2):
+    """Residual sum of squares of the two-factor main-effects (no interaction) model."""
+    n1 = codes1.max() + 1
+    n2 = codes2.max() + 1
+    cells = np.bincount(codes1 * n2 + codes2, minlength=n1 * n2).reshape(n1, n2)
+    # Normal equations of the dummy-coded design [one-hot codes1, one-hot codes2 minus its first level]
+    xtx = np.zeros((n1 + n2 - 1, n1 + n2 - 1))
+    xtx[:n1, :n1] = np.diag(cells.sum(axis=1))
+    xtx[n1:, n1:] = np.diag(cells.sum(axis=0)[1:])
+    xtx[:n1, n1:] = cells[:, 1:]
+    xtx[n1:, :n1] = cells[:, 1:].T
+    xty = np.concatenate([np.bincount(codes1, weights=values, minlength=n1),
+                          np.bincount(codes2, weights=values, minlength=n2)[1:]])
+    beta = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+    return (values ** 2).sum() - beta @ xty
+
+
+def fast_anova(values, *factor_codes):
+    """
+    One- or two-way between-subjects ANOVA from integer factor codes.
+
+    Sums of squares come from np.bincount group sums instead of a model fit.
+    For two factors they are type II. When every factor combination has data,
+    they match pingouin.anova for balanced and unbalanced designs alike. With
+    empty cells (e.g. a dataset without Visual trials) the interaction and
+    residual degrees of freedom count only the filled cells (filled cells -
+    levels + 1 and n - filled cells), so the table differs from pingouin's,
+    which assumes a full factorial design.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Dependent variable
+    *factor_codes : numpy.ndarray
+        One or two arrays of non-negative integer level codes, one per factor
+
+    Returns:
+    --------
+    tuple
+        (ss, df, f, p) arrays with one entry per effect followed by the residual,
+        i.e. [factor, residual] or [factor1, factor2, interaction, residual].
+        f and p are NaN for the residual.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values - values.mean()
+    codes = [np.unique(c, return_inverse=True)[1].ravel() for c in factor_codes]
+    levels = [c.max() + 1 for c in codes]
+    total = (values ** 2).sum()
+
+    if len(codes) == 1:
+        resid = _residual_ss(values, codes[0])
+        ss = np.array([total - resid, resid])
+        df = np.array([levels[0] - 1, values.size - levels[0]])
+    else:
+        rss1 = _residual_ss(values, codes[0])
+        rss2 = _residual_ss(values, codes[1])
+        additive = _additive_residual_ss(values, codes[0], codes[1])
+        cells = np.unique(codes[0] * levels[1] + codes[1], return_inverse=True)[1].ravel()
+        n_cells = cells.max() + 1
+        resid = _residual_ss(values, cells)
+        ss = np.array([rss2 - additive, rss1 - additive, additive - resid, resid])
+        df = np.array([levels[0] - 1, levels[1] - 1, n_cells - levels[0] - levels[1] + 1,
+                       values.size - n_cells])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = (ss[:-1] / df[:-1]) / (ss[-1] / df[-1])
+        p = fdtrc(df[:-1], df[-1], f)
+    return ss, df, np.append(f, np.nan), np.append(p, np.nan)
+
+
+def classical_mds(distances, n_components=2):
+    """
+    Classical (Torgerson) multidimensional scaling.
+
+    Embeds the points so that their Euclidean distances approximate the given
+    dissimilarities, using the top eigenvectors of the double-centred squared
+    distance matrix. This is a single eigendecomposition rather than the
+    iterative SMACOF fit of sklearn.manifold.MDS, and it is deterministic up
+    to the sign convention below. Use sklearn's MDS when a non-metric
+    (rank-order) embedding is wanted instead.
+
+    Parameters:
+    -----------
+    distances : numpy.ndarray
+        Condensed distance vector (as returned by scipy.spatial.distance.pdist)
+        or a square distance matrix
+    n_components : int
+        Number of embedding dimensions
+
+    Returns:
+    --------
+    numpy.ndarray
+        (n_points, n_components) coordinates, each axis oriented so that its
+        largest-magnitude coordinate is positive
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    d2 = (squareform(distances) if distances.ndim == 1 else distances) ** 2
+    n = d2.shape[0]
+    b = -0.5 * (d2 - d2.mean(axis=0) - d2.mean(axis=1)[:, None] + d2.mean())
+    k = min(n_components, n)
+    w, v = eigh(b, subset_by_index=[n - k, n - 1])
+    w, v = w[::-1], v[:, ::-1]
+    v = v * np.sign(v[np.abs(v).argmax(axis=0), np.arange(k)])
+    coords = np.zeros((n, n_components))
+    coords[:, :k] = v * np.sqrt(np.clip(w, 0, None))
+    return coords
+
+
+# pdist metric names handled by condensed_distances, mapped to its metric codes
+DISTANCE_METRICS = {"euclidean": 0, "cityblock": 1, "chebyshev": 2, "cosine": 3}
+
+
+@njit(cache=True, parallel=True, error_model="numpy")
+def condensed_distances(points, metric):
+    """
+    Pairwise distances between the rows of points in pdist's condensed order.
+
+    metric is a DISTANCE_METRICS code. Rows are processed in parallel; row i
+    fills the slice of the condensed vector holding its pairs (i, j > i).
+    Cosine distances follow scipy, including NaN for all-zero rows.
+    """
+    n, d = points.shape
+    out = np.empty(n * (n - 1) // 2)
+    for i in prange(n - 1):
+        offset = i * n - i * (i + 1) // 2
+        for j in range(i + 1, n):
+            acc = 0.0
+            if metric == 3:
+                norm_i = 0.0
+                norm_j = 0.0
+                for k in range(d):
+                    acc += points[i, k] * points[j, k]
+                    norm_i += points[i, k] * points[i, k]
+                    norm_j += points[j, k] * points[j, k]
+                cosine = acc / np.sqrt(norm_i * norm_j)
+                if abs(cosine) > 1.0:
+                    cosine = 1.0 if cosine > 0 else -1.0
+                acc = 1.0 - cosine
+            else:
+                for k in range(d):
+                    diff = abs(points[i, k] - points[j, k])
+                    if metric == 0:
+                        acc += diff * diff
+                    elif metric == 1:
+                        acc += diff
+                    elif diff > acc:
+                        acc = diff
+                if metric == 0:
+                    acc = np.sqrt(acc)
+            out[offset + j - i - 1] = acc
+    return out
+
+
+def pairwise_distances(points, metric="euclidean"):
+    """
+    Drop-in for scipy.spatial.distance.pdist(points, metric).
+
+    Uses the parallel condensed_distances kernel for the DISTANCE_METRICS when
+    Numba is installed, and scipy's pdist otherwise.
+    """
+    if not HAVE_NUMBA or metric not in DISTANCE_METRICS:
+        return pdist(points, metric=metric)
+    points = np.asarray(points, dtype=np.float64)
+    return condensed_distances(points.reshape(len(points), -1), DISTANCE_METRICS[metric])
+
+
+def precompile():
+    """
+    Run every compiled kernel once on small dummy arrays.
+
+    Numba compiles each kernel on its first call and writes the machine code
+    next to the module in __pycache__. Calling this after a fresh install (see
+    ``python srt_analysis_deluxe_GUI.py --precompile``) fills that cache, so
+    the first plots in the GUI do not wait for the JIT. It does not apply to
+    frozen builds, which run the NumPy code. Returns False when Numba is not
+    in use and there is nothing to compile.
+    """
+    if not HAVE_NUMBA:
+        return False
+    starts = np.array([0, 2, 4], dtype=np.int64)
+    grids = np.linspace(0.0, 1.0, 3)[None, :]
+    for dtype in (np.float64, np.float32):
+        grouped_ecdfs(np.arange(4, dtype=dtype), starts, grids)
+    groups = np.arange(4.0).reshape(2, 2)
+    batched_ttest(groups, np.array([2, 2], dtype=np.int64),
+                  np.array([0], dtype=np.int64), np.array([1], dtype=np.int64))
+    condensed_distances(groups, DISTANCE_METRICS["euclidean"])
+    bayes_factors([1.0], [10], [10])
+    return True
@@ -1,170 +1,468 @@
 #!/usr/bin/env python3
+import argparse
+import contextlib
+import logging
 import os
+import signal
 import sys
 import subprocess
-import tempfile
 import shutil
+import tempfile
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Use a permanent folder in the project for the Matplotlib cache instead of /tmp
 mpl_cache = os.path.join(os.getcwd(), "mplcache")
-os.makedirs(mpl_cache, exist_ok=True)
-print(f"Prebuilding matplotlib font cache in {mpl_cache} ...")
-# Pre-build the font cache by importing matplotlib; this builds and saves the cache in mplcache
-subprocess.run([sys.executable, "-c", "import matplotlib.pyplot as plt; plt.figure()"], check=True)
-# Set MPLCONFIGDIR for the current process
-os.environ["MPLCONFIGDIR"] = mpl_cache
-print(f"Set MPLCONFIGDIR to {mpl_cache}")
-
-# Increase recursion limit for the local Python process
-sys.setrecursionlimit(10000)
-
-def main():
-    """Build CART-GUI application using PyInstaller with appropriate settings."""
-    print("Building CART-GUI application...")
+
+log = logging.getLogger("build_app_mac")
+
+APP_NAME = "CART-GUI"
+SPEC_PATH = f"{APP_NAME}.spec"
+ENTRY_SCRIPT = "srt_analysis_deluxe_GUI.py"
+# Runtime hook paths are handed to the spec through this variable since the hooks are temporary files
+RUNTIME_HOOKS_ENV = "CART_GUI_RUNTIME_HOOKS"
+
+HIDDEN_IMPORTS = [
+    "pandas",
+    "numpy",
+    "matplotlib",
+    "scipy",
+    "scipy.stats",
+    "scipy.spatial.distance",
+    "scipy.stats.mstats",
+    "matplotlib.backends.backend_qt5agg",
+    "PyQt5",
+    "PyQt5.QtCore",
+    "PyQt5.QtGui",
+    "PyQt5.QtWidgets",
+]
+# Collect only the Qt modules the GUI uses rather than all of PyQt5
+COLLECT_SUBMODULES = ["PyQt5.QtCore", "PyQt5.QtGui", "PyQt5.QtWidgets"]
+# Optional RAM disk for --ramdisk builds
+RAMDISK_NAME = "CARTBUILD"
+RAMDISK_SIZE = 1024 ** 3
+RAMDISK_MIN_FREE = 4 * 1024 ** 3
+
+# Qt plugin families the GUI needs at runtime
+QT_PLUGIN_FAMILIES = ["platforms", "styles"]
+EXCLUDES = [
+    "PyQt5.QtWebEngineWidgets",
+    "PyQt5.QtQml",
+    "PyQt5.QtMultimedia",
+    "tkinter",
+    # _srt_kernels runs its NumPy fallbacks in frozen builds, so Numba is not bundled
+    "numba",
+    "llvmlite",
+    # Only used to cross-check the statistics kernels during development
+    "pingouin",
+    # No longer used now that MDS and min-max scaling are done with NumPy and SciPy
+    "sklearn",
+    # Test suites and interactive tooling pulled in by the scientific stack
+    "pandas.tests",
+    "numpy.tests",
+    "scipy.tests",
+    "matplotlib.tests",
+    "IPython",
+    "notebook",
+    "pytest",
+]
+
+SPEC_TEMPLATE = """# -*- mode: python ; coding: utf-8 -*-
+# Generated by build_app_mac.py; rerun it with --regen-spec instead of editing this file.
+import os
+import PyQt5
+from PyInstaller.utils.hooks import collect_dynamic_libs, collect_submodules
+
+# Bundle only the Qt plugin families the app needs, at the path the Qt runtime hook points QT_PLUGIN_PATH to
+qt_plugins = os.path.join(os.path.dirname(PyQt5.__file__), 'Qt5', 'plugins')
+plugin_datas = [
+    (os.path.join(qt_plugins, family), f'PyQt5/Qt5/plugins/{{family}}')
+    for family in {qt_plugin_families!r}
+    if os.path.isdir(os.path.join(qt_plugins, family))
+]
+binaries = [
+    (src, dest) for src, dest in collect_dynamic_libs('PyQt5')
+    if not dest.replace(os.sep, '/').startswith('PyQt5/Qt5/plugins')
+]
+
+hiddenimports = {hidden_imports!r}
+for package in {collect_submodules!r}:
+    hiddenimports += collect_submodules(package)
+
+a = Analysis(
+    [{entry_script!r}],
+    pathex=[],
+    binaries=binaries,
+    # Include the mplcache folder so the bundled app has a pre-built font cache
+    datas=[('docs/images', 'docs/images'), ('mplcache', 'mplcache')] + plugin_datas,
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    hooksconfig={{}},
+    runtime_hooks=os.environ[{hooks_env!r}].split(os.pathsep),
+    excludes={excludes!r},
+    noarchive=False,
+    # Byte-compile the frozen modules with -OO, as in srt_analysis_win.spec
+    optimize=2,
+)
+
+pyz = PYZ(a.pure)
+
+# Onedir bundle: the app launches straight from Contents/ instead of
+# unpacking into a temporary _MEI* directory on every start (runtime_tmpdir is unused)
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name={app_name!r},
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    # PyInstaller never applies UPX on macOS, and it would break the code signatures anyway
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=[{icon!r}],
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    name={app_name!r},
+)
+
+app = BUNDLE(
+    coll,
+    name={app_bundle!r},
+    icon={icon!r},
+    bundle_identifier={bundle_identifier!r},
+)
+"""
+
+PROJECT_DIR = Path(__file__).resolve().parent
+# The app icon is kept as a Windows .ico; the macOS .icns is checked in next to the docs images
+ICON_SOURCE = PROJECT_DIR / "APPIcon.ico"
+ICNS_PATH = PROJECT_DIR / "docs" / "images" / "AppIcon.icns"
+
+# rpath under which the bundled Qt libraries are found
+FRAMEWORKS_RPATH = "@executable_path/../Frameworks"
+
+# Increase recursion limit for the local Python process and the bundled app
+RECURSION_LIMIT = 10000
+sys.setrecursionlimit(RECURSION_LIMIT)
+
+def prime_mpl_cache():
+    """Pre-build the matplotlib font cache in mplcache once per installed matplotlib version."""
+    from importlib.metadata import version
     
-    # Create a temporary runtime hook to increase recursion limit and set MPLCONFIGDIR for the bundled app
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as hook_file:
-        hook_path = hook_file.name
-        hook_file.write("import sys\n")
-        hook_file.write("sys.setrecursionlimit(10000)\n")
+    os.makedirs(mpl_cache, exist_ok=True)
+    # Set MPLCONFIGDIR for the current process and the priming subprocess
+    os.environ["MPLCONFIGDIR"] = mpl_cache
+    print(f"Set MPLCONFIGDIR to {mpl_cache}")
+    sentinel = Path(mpl_cache) / f".primed_{version('matplotlib')}"
+    if sentinel.exists() and any(Path(mpl_cache).glob("fontlist-v*.json")):
+        print(f"Reusing matplotlib font cache in {mpl_cache}")
+        return
+    print(f"Prebuilding matplotlib font cache in {mpl_cache} ...")
+    try:
+        # Importing pyplot builds and saves the font cache in mplcache
+        subprocess.run([sys.executable, "-c", "import matplotlib.pyplot as plt; plt.figure()"], check=True)
+        sentinel.touch()
+    except subprocess.CalledProcessError as e:
+        print(f"Could not prebuild the matplotlib font cache (exit code {e.returncode}); the app will build it on first launch.")
+
+def available_memory():
+    """Return the available memory in bytes, falling back to physical memory when psutil is missing."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+@contextlib.contextmanager
+def ramdisk_workpath(enabled):
+    """Attach a RAM disk for PyInstaller's intermediate files and yield its mount point, or None if unused."""
+    if not enabled:
+        yield None
+        return
+    if sys.platform != 'darwin' or available_memory() < RAMDISK_MIN_FREE:
+        print("RAM disk needs macOS and at least 4 GB of free memory; using build/ instead.")
+        yield None
+        return
+    
+    sectors = RAMDISK_SIZE // 512
+    device = subprocess.check_output(["hdiutil", "attach", "-nomount", f"ram://{sectors}"]).decode().strip()
+    try:
+        subprocess.run(["diskutil", "erasevolume", "HFS+", RAMDISK_NAME, device], check=True, capture_output=True)
+        print(f"Using RAM disk {device} at /Volumes/{RAMDISK_NAME} for the PyInstaller work path")
+        yield f"/Volumes/{RAMDISK_NAME}"
+    finally:
+        subprocess.run(["hdiutil", "detach", device, "-force"], capture_output=True)
+
+def run_pyinstaller(cmd):
+    """Run PyInstaller in this interpreter instead of spawning the pyinstaller console script."""
+    import PyInstaller.__main__
+    try:
+        PyInstaller.__main__.run(cmd[1:])
+    except SystemExit as e:
+        # PyInstaller reports failures by exiting; surface them like a failed subprocess
+        if e.code not in (None, 0):
+            raise subprocess.CalledProcessError(e.code if isinstance(e.code, int) else 1, cmd)
+
+def write_runtime_hooks(hook_dir):
+    """Write the runtime hooks for the bundled app into hook_dir and return their paths."""
+    # Runtime hook to increase recursion limit and set MPLCONFIGDIR for the bundled app
+    hook_path = os.path.join(hook_dir, "recursion_hook.py")
+    Path(hook_path).write_text(textwrap.dedent(f"""\
+        import sys
+        sys.setrecursionlimit({RECURSION_LIMIT})
         # Set MPLCONFIGDIR in the bundled app to the bundled mplcache folder
-        hook_file.write("import os\n")
-        hook_file.write("os.environ['MPLCONFIGDIR'] = 'mplcache'\n")
-        hook_file.write("print('PyInstaller: Recursion limit increased and MPLCONFIGDIR set to mplcache')\n")
+        import os
+        os.environ['MPLCONFIGDIR'] = 'mplcache'
+        print('PyInstaller: Recursion limit increased and MPLCONFIGDIR set to mplcache')
+    """))
     
-    # Create a PyQt5 hook to fix Qt library paths
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as qt_hook_file:
-        qt_hook_path = qt_hook_file.name
-        qt_hook_file.write("import os\n")
-        qt_hook_file.write("import sys\n")
-        qt_hook_file.write("import PyQt5\n\n")
-        qt_hook_file.write("# Add PyQt5 binary directory to PATH to help find Qt libraries\n")
-        qt_hook_file.write("pyqt_dir = os.path.dirname(PyQt5.__file__)\n")
-        qt_hook_file.write("os.environ['PATH'] = os.path.join(pyqt_dir, 'Qt5', 'bin') + os.pathsep + os.environ['PATH']\n")
-        qt_hook_file.write("# Set QT_PLUGIN_PATH environment variable\n")
-        qt_hook_file.write("os.environ['QT_PLUGIN_PATH'] = os.path.join(pyqt_dir, 'Qt5', 'plugins')\n")
+    # PyQt5 hook to fix Qt library paths
+    qt_hook_path = os.path.join(hook_dir, "qt_hook.py")
+    Path(qt_hook_path).write_text(textwrap.dedent("""\
+        import os
+        import sys
+
+        # Resolve Qt paths inside the bundle rather than importing PyQt5 to locate them
+        qt_dir = os.path.join(sys._MEIPASS, 'PyQt5', 'Qt5')
+        # Add the bundled Qt binary directory to PATH to help find Qt libraries
+        os.environ['PATH'] = os.path.join(qt_dir, 'bin') + os.pathsep + os.environ['PATH']
+        # Point Qt at the plugin families bundled by the spec
+        os.environ['QT_PLUGIN_PATH'] = os.path.join(qt_dir, 'plugins')
+    """))
     
     print(f"Created runtime hook at {hook_path}")
     print(f"Created PyQt5 hook at {qt_hook_path}")
+    return [hook_path, qt_hook_path]
+
+def convert_icon(source, icns):
+    """Regenerate icns from source with sips and iconutil, overwriting the checked-in file."""
+    if shutil.which("sips") is None or shutil.which("iconutil") is None:
+        print(f"Warning: sips/iconutil not available; keeping the checked-in {icns.name}.")
+        return
     
-    # Define the PyInstaller command; note the addition of the mplcache folder as data
-    cmd = [
-        "pyinstaller",
-        "--name=CART-GUI",
-        "--windowed",
-        "--clean",
-        f"--runtime-hook={hook_path}",
-        f"--runtime-hook={qt_hook_path}",
-        "--icon=docs/images/main_gui.png",
-        "--add-data=docs/images:docs/images",
-        # Include the mplcache folder so the bundled app has a pre-built font cache
-        f"--add-data={mpl_cache}{os.pathsep}mplcache",
-        "--collect-all=PyQt5",
-        "--hidden-import=pandas",
-        "--hidden-import=numpy",
-        "--hidden-import=matplotlib",
-        "--hidden-import=scipy",
-        "--hidden-import=scipy.stats",
-        "--hidden-import=scipy.spatial.distance",
-        "--hidden-import=scipy.stats.mstats",
-        "--hidden-import=sklearn",
-        "--hidden-import=sklearn.manifold",
-        "--hidden-import=sklearn.preprocessing",
-        "--hidden-import=pingouin",
-        "--hidden-import=matplotlib.backends.backend_qt5agg",
-        "--hidden-import=PyQt5",
-        "--hidden-import=PyQt5.QtCore",
-        "--hidden-import=PyQt5.QtGui",
-        "--hidden-import=PyQt5.QtWidgets",
-        "srt_analysis_deluxe_GUI.py"
-    ]
-    
-    # Insert macOS-specific options if on darwin
+    print(f"Converting {source.name} to {icns.name} ...")
+    with tempfile.TemporaryDirectory() as tmp:
+        iconset = Path(tmp) / "AppIcon.iconset"
+        iconset.mkdir()
+        for size in (16, 32, 128, 256):
+            for scale in (1, 2):
+                if size * scale > 256:
+                    continue
+                name = f"icon_{size}x{size}{'@2x' if scale == 2 else ''}.png"
+                subprocess.run(["sips", "-s", "format", "png", "-z", str(size * scale), str(size * scale),
+                                str(source), "--out", str(iconset / name)], check=True, capture_output=True)
+        subprocess.run(["iconutil", "-c", "icns", str(iconset), "-o", str(icns)], check=True)
+
+def write_spec():
+    """Write the PyInstaller spec for the app from the settings defined in this module."""
+    icon = "docs/images/main_gui.png"
+    bundle_identifier = None
+    # Use the macOS icon and bundle identifier if on darwin
     if sys.platform == 'darwin':
-        icns_path = "/Users/David/Documents/GitHub/Simple_SRT/Analysis/AppIcon.icns"
-        if not os.path.exists(icns_path):
-            print(f"Warning: {icns_path} not found. App will have default icon.")
-            print("To create an ICNS file from PNG, see instructions in BUILD_INSTRUCTIONS.md")
-        else:
-            cmd.insert(5, f"--osx-bundle-identifier=org.cart-gui")
-            cmd.insert(5, f"--icon={icns_path}")
+        icon = str(ICNS_PATH.relative_to(PROJECT_DIR))
+        bundle_identifier = "org.cart-gui"
     
-    print("Running PyInstaller with the following command:")
-    print(" ".join(cmd))
-    print("\nThis may take several minutes...\n")
+    spec = SPEC_TEMPLATE.format(
+        hidden_imports=HIDDEN_IMPORTS,
+        collect_submodules=COLLECT_SUBMODULES,
+        excludes=EXCLUDES,
+        qt_plugin_families=QT_PLUGIN_FAMILIES,
+        entry_script=ENTRY_SCRIPT,
+        hooks_env=RUNTIME_HOOKS_ENV,
+        app_name=APP_NAME,
+        app_bundle=f"{APP_NAME}.app",
+        icon=icon,
+        bundle_identifier=bundle_identifier,
+    )
+    Path(SPEC_PATH).write_text(spec)
+    print(f"Wrote {SPEC_PATH}")
+
+def main(argv=None):
+    """Build CART-GUI application using PyInstaller with appropriate settings."""
+    parser = argparse.ArgumentParser(description="Build the CART-GUI macOS application.")
+    parser.add_argument("--regen-spec", action="store_true",
+                        help=f"regenerate {SPEC_PATH} and run a clean build instead of reusing the cached analysis")
+    parser.add_argument("--ramdisk", action="store_true",
+                        help="put PyInstaller's work directory on a RAM disk (macOS only); "
+                             "the Analysis cache in build/ is not reused")
+    parser.add_argument("--regen-icon", action="store_true",
+                        help=f"regenerate {ICNS_PATH.name} from {ICON_SOURCE.name} with sips and iconutil "
+                             "(macOS only; overwrites the checked-in file)")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log every file touched while post-processing the bundle")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s",
+                        handlers=[logging.StreamHandler(sys.stderr)])
     
-    result_code = 0
-    try:
-        subprocess.run(cmd, check=True)
-        print("\nBuild completed successfully!")
-        print("The application can be found in the 'dist' directory.")
+    print("Building CART-GUI application...")
+    prime_mpl_cache()
+    if args.regen_icon:
+        convert_icon(ICON_SOURCE, ICNS_PATH)
+    
+    # Exit through SystemExit on Ctrl+C so the temporary hook directory is always removed
+    signal.signal(signal.SIGINT, lambda signum, frame: sys.exit(130))
+    
+    with tempfile.TemporaryDirectory(prefix="cartgui_hooks_") as hook_dir, ramdisk_workpath(args.ramdisk) as workpath:
+        hook_paths = write_runtime_hooks(hook_dir)
         
-        # Automatically fix Qt library rpaths in the bundle on macOS
-        if sys.platform == 'darwin':
-            fix_macos_bundle()
+        regen = args.regen_spec or not os.path.exists(SPEC_PATH)
+        if regen:
+            write_spec()
+        else:
+            print(f"Reusing {SPEC_PATH}; pass --regen-spec to regenerate it")
+        os.environ[RUNTIME_HOOKS_ENV] = os.pathsep.join(hook_paths)
         
-    except subprocess.CalledProcessError as e:
-        print(f"\nBuild failed with error code {e.returncode}")
-        print("See the output above for more details.")
-        result_code = e.returncode
-    finally:
-        # Clean up the temporary hook files
+        # Build from the spec so Analysis results cached in build/ are reused; only a fresh spec needs a clean build
+        cmd = ["pyinstaller", "--noconfirm", *(["--clean"] if regen else []), SPEC_PATH]
+        if workpath:
+            cmd.insert(-1, f"--workpath={workpath}")
+        
+        print("Running PyInstaller with the following command:")
+        print(" ".join(cmd))
+        print("\nThis may take several minutes...\n")
+        
+        result_code = 0
         try:
-            os.unlink(hook_path)
-            os.unlink(qt_hook_path)
-            print("Removed temporary hook files")
-        except Exception as e:
-            print(f"Could not remove temporary hook files: {e}")
+            run_pyinstaller(cmd)
+            print("\nBuild completed successfully!")
+            print("The application can be found in the 'dist' directory.")
+            
+            # Automatically fix Qt library rpaths in the bundle on macOS
+            if sys.platform == 'darwin':
+                fix_macos_bundle()
+            
+        except subprocess.CalledProcessError as e:
+            print(f"\nBuild failed with error code {e.returncode}")
+            print("See the output above for more details.")
+            result_code = e.returncode
     
     return result_code
 
+def load_commands(binary):
+    """Return the @rpath/Qt* dependencies and the LC_RPATH entries of a Mach-O binary."""
+    from macholib.MachO import MachO
+    from macholib.mach_o import LC_LOAD_DYLIB, LC_RPATH
+
+    qt_deps, rpaths = set(), set()
+    # Slices of a universal binary share their dylib and rpath load commands, so the first header suffices
+    header = MachO(str(binary)).headers[0]
+    for load_cmd, _cmd, data in header.commands:
+        if load_cmd.cmd == LC_RPATH:
+            rpaths.add(data.rstrip(b"\x00").decode())
+        elif load_cmd.cmd == LC_LOAD_DYLIB and data.startswith(b"@rpath/Qt"):
+            qt_deps.add(data.rstrip(b"\x00").decode())
+    return qt_deps, rpaths
+
+def add_rpath(binary, rpath=FRAMEWORKS_RPATH):
+    """Add an LC_RPATH entry to binary."""
+    subprocess.run(["install_name_tool", "-add_rpath", rpath, str(binary)], check=True, capture_output=True)
+
+def resign(binary):
+    """Ad-hoc re-sign a binary whose signature was invalidated by install_name_tool."""
+    subprocess.run(["codesign", "--force", "--sign", "-", str(binary)], check=True, capture_output=True)
+
+def ensure_rpath(binary, rpath=FRAMEWORKS_RPATH):
+    """Add rpath to binary unless it is already present; return True if the binary was changed."""
+    if rpath in load_commands(binary)[1]:
+        return False
+    add_rpath(binary, rpath)
+    return True
+
+def run_parallel(func, paths):
+    """Run func over independent paths on a thread pool, log results in order and return how many changed."""
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [(path, executor.submit(func, path)) for path in paths]
+    changed = 0
+    for path, future in futures:
+        try:
+            message = future.result()
+            if message:
+                changed += 1
+                log.debug(message)
+        except Exception as e:
+            log.error("Error processing %s: %s", path.name, e)
+    return changed
+
 def fix_macos_bundle():
-    """Perform post-processing fixes on the macOS bundle to adjust Qt library rpaths."""
+    """Perform post-processing fixes on the macOS bundle so Qt libraries resolve through @rpath."""
     app_path = Path('dist/CART-GUI.app')
     frameworks_dir = app_path / 'Contents' / 'Frameworks'
     
-    print("\nPerforming post-build fixes on macOS bundle...")
+    log.info("\nPerforming post-build fixes on macOS bundle...")
     try:
-        # Create a folder for Qt libraries if it does not exist
-        qt_libs_dir = frameworks_dir / 'Qt'
-        if not qt_libs_dir.exists():
-            qt_libs_dir.mkdir(exist_ok=True)
-            print(f"Created {qt_libs_dir}")
-        
-        # Move any Qt libraries from Frameworks that start with 'Qt' into the Qt folder
-        for qt_file in frameworks_dir.glob('Qt*'):
-            if qt_file.is_file():
-                target = qt_libs_dir / qt_file.name
-                if not target.exists():
-                    shutil.move(str(qt_file), str(target))
-                    print(f"Moved {qt_file.name} to {target}")
+        # Qt libraries stay where PyInstaller placed them; an rpath on the executable lets @rpath/Qt* resolve
+        executable = app_path / 'Contents' / 'MacOS' / 'CART-GUI'
+        changed = int(ensure_rpath(executable))
+        if changed:
+            log.info("Added rpath %s to %s", FRAMEWORKS_RPATH, executable.name)
         
-        # Create symlinks in the Frameworks directory for the Qt libraries from the Qt folder
-        for target_file in qt_libs_dir.iterdir():
-            symlink_path = frameworks_dir / target_file.name
-            if not symlink_path.exists():
-                os.symlink(target_file, symlink_path)
-                print(f"Created symlink: {symlink_path} -> {target_file}")
-        
-        # Fix rpaths in PyQt5 libraries (e.g., QtWidgets.abi3.so) if they refer to @rpath/QtWidgets
+        # Give PyQt5 extension modules that link @rpath/Qt* the same rpath, skipping ones that already have it
         pyqt5_dir = frameworks_dir / "PyQt5"
         if pyqt5_dir.exists():
-            for so_file in pyqt5_dir.glob("*.so*"):
-                try:
-                    otool_output = subprocess.check_output(["otool", "-L", str(so_file)]).decode()
-                    if "@rpath/QtWidgets" in otool_output:
-                        new_path = "@executable_path/../Frameworks/Qt/QtWidgets"
-                        subprocess.run(["install_name_tool", "-change", "@rpath/QtWidgets", new_path, str(so_file)], check=True)
-                        print(f"Fixed rpath for {so_file.name}: @rpath/QtWidgets -> {new_path}")
-                except Exception as e:
-                    print(f"Error processing {so_file.name}: {e}")
+            def fix_one(so_file):
+                qt_deps, rpaths = load_commands(so_file)
+                if qt_deps and FRAMEWORKS_RPATH not in rpaths:
+                    add_rpath(so_file)
+                    resign(so_file)
+                    return f"Added rpath {FRAMEWORKS_RPATH} to {so_file.name}"
+                return None
+
+            # One scandir pass; symlinked entries point at files that are patched through their target
+            with os.scandir(pyqt5_dir) as entries:
+                so_files = [Path(e.path) for e in entries if ".so" in e.name and e.is_file(follow_symlinks=False)]
+            fixed = run_parallel(fix_one, so_files)
+            changed += fixed
+            log.info("Added rpath %s to %d PyQt5 extension modules", FRAMEWORKS_RPATH, fixed)
         else:
-            print("No PyQt5 directory found in Frameworks; skipping rpath fixes for PyQt5 libraries.")
+            log.info("No PyQt5 directory found in Frameworks; skipping rpath fixes for PyQt5 libraries.")
         
-        print("macOS bundle post-processing completed.")
+        # Patched extensions were re-signed individually, so resealing the bundle needs no --deep walk
+        if changed:
+            resign(app_path)
+            log.info("Re-signed %s", app_path.name)
+        
+        log.info("macOS bundle post-processing completed.")
     except Exception as e:
-        print(f"Error during bundle post-processing: {e}")
+        log.error("Error during bundle post-processing: %s", e)
+
+    package_macos_bundle()
+
+def package_macos_bundle():
+    """Verify the code signature of the bundle and zip it for release, preserving symlinks."""
+    app_path = Path('dist/CART-GUI.app')
+    if not app_path.exists():
+        log.warning("%s not found; skipping packaging.", app_path)
+        return
+
+    try:
+        subprocess.run(["codesign", "--verify", "--deep", "--strict", str(app_path)], check=True)
+        log.info("Code signature verified.")
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        log.error("Code signature verification failed: %s", e)
+
+    # zip -y stores symlinks as links so the Qt frameworks are not duplicated in the archive
+    try:
+        archive = Path('dist/CART-GUI.zip')
+        if archive.exists():
+            archive.unlink()
+        subprocess.run(["zip", "-y", "-r", "-q", archive.name, app_path.name], cwd="dist", check=True)
+        log.info("Created release archive %s", archive)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        log.error("Could not create release archive: %s", e)
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -1,8 +1,7 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.stats import ttest_ind, linregress
-from pingouin import bayesfactor_ttest, anova
+from scipy.stats import linregress
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QFileDialog, QVBoxLayout, QWidget,
     QLabel, QComboBox, QFormLayout, QHBoxLayout, QMessageBox,QFrame,
@@ -10,22 +9,72 @@ from PyQt5.QtWidgets import (
     QTableWidgetItem, QSpinBox, QSlider, QFileDialog, QRadioButton, QButtonGroup, QScrollArea, QListWidget, QInputDialog,
     QTabWidget, QGroupBox, QListWidgetItem , QColorDialog
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib import colors as mcolors
-import scipy
 import scipy.stats as stats
-from scipy.stats import zscore
-from sklearn.manifold import MDS
-from sklearn.preprocessing import StandardScaler
 import matplotlib.cm as cm
 import sys
 import os
 import json
-from sklearn.preprocessing import MinMaxScaler
+import re
+import weakref
+from _srt_kernels import (bayes_factor_pairs, classical_mds, fast_anova, modality_ecdfs, pairwise_distances,
+                          percentile_ranks, precompile, ttest_pairs)
 
 sys.setrecursionlimit(5000)
+
+# Keys of the per-participant reaction time arrays built by _build_soa_cache
+SOA_MODALITY_KEYS = {1: 'audio', 2: 'visual', 3: 'av'}
+# Bar hatch for each dataset fill pattern; 'solid' and 'clear' bars have none
+PATTERN_HATCHES = {'hatched': '///', 'dotted': '...', 'dashed': '--', 'cross-hatched': 'xxx'}
+
+# MDS scatters with more points than this are drawn as a raster layer in saved PDF/SVG/EPS files
+VECTOR_POINT_LIMIT = 500
+
+_DIGITS_RE = re.compile(r'([0-9]+)')
+
+
+def natural_sort_key(s):
+    """Sort key that orders embedded numbers numerically, e.g. P2 before P10."""
+    return [int(text) if text.isdigit() else text.lower() for text in _DIGITS_RE.split(str(s))]
+
+
+def _as_float(value):
+    """float(value), or NaN when the value is missing or not numeric."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _pattern_facecolor(pattern, color):
+    """Face colour of a bar or box drawn with a dataset fill pattern and edge colour."""
+    if pattern == 'solid':
+        return color
+    return 'none' if pattern == 'clear' else 'white'
+
+
+def _minmax_inplace(X):
+    """Scale each column of the float array X to [0, 1] in place, as MinMaxScaler does; returns X."""
+    mn = X.min(axis=0)
+    rng = X.max(axis=0) - mn
+    rng[rng == 0] = 1.0
+    np.subtract(X, mn, out=X)
+    np.divide(X, rng, out=X)
+    return X
+
+# Per-modality reaction time summaries offered as participant features: name -> (statistic, modality)
+MODALITY_RT_FEATURES = {
+    'Mean RT (Audio)': ('mean', 1), 'Mean RT (Visual)': ('mean', 2), 'Mean RT (Audiovisual)': ('mean', 3),
+    'Median RT (Audio)': ('median', 1), 'Median RT (Visual)': ('median', 2),
+    'Median RT (Audiovisual)': ('median', 3),
+    'Interquartile Range (Total)': ('iqr', None), 'Interquartile Range (Audio)': ('iqr', 1),
+    'Interquartile Range (Visual)': ('iqr', 2), 'Interquartile Range (Audiovisual)': ('iqr', 3),
+}
+
+
 class RangeSlider(QWidget):
     valueChanged = pyqtSignal(float, float)
 
@@ -66,6 +115,13 @@ class RangeSlider(QWidget):
         self.first_slider.valueChanged.connect(self.on_first_slider_value_changed)
         self.second_slider.valueChanged.connect(self.on_second_slider_value_changed)
 
+        # Emit valueChanged once the handles settle instead of on every tick of a drag
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(50)
+        self._debounce_timer.timeout.connect(
+            lambda: self.valueChanged.emit(self.first_position, self.second_position))
+
     def on_first_slider_value_changed(self, value):
         if value > self.second_slider.value():
             self.first_slider.setValue(self.second_slider.value())
@@ -73,7 +129,7 @@ class RangeSlider(QWidget):
         self.first_position = self._scaled_value(value)
         # Update label for first slider
         self.first_label.setText(f"{self.first_position:.{self.precision}f}")
-        self.valueChanged.emit(self.first_position, self.second_position)
+        self._debounce_timer.start()
 
     def on_second_slider_value_changed(self, value):
         if value < self.first_slider.value():
@@ -82,7 +138,7 @@ class RangeSlider(QWidget):
         self.second_position = self._scaled_value(value)
         # Update label for second slider
         self.second_label.setText(f"{self.second_position:.{self.precision}f}")
-        self.valueChanged.emit(self.first_position, self.second_position)
+        self._debounce_timer.start()
 
     def _scaled_value(self, slider_value):
         """Convert slider int value (0-100) to actual float in min_value to max_value range"""
@@ -126,12 +182,19 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         # Add these lines to initialize data-related attributes
         self.data = None
         self.original_data = None
+        self._violation_cache = {}  # {("violations" | "values", dataset, ...): (DataFrame, settings, result)}
+        self._participant_items = None  # (dataset names, DataFrames, selector entries) of the last refresh
+        self._filtered_data_cache = {}  # {dataset: (filter inputs, filtered DataFrame)}
+        self._rt_summary_cache = {}  # {(dataset, 'mean' | 'median'): (filtered DataFrame, (centre, SEM))}
+        self._violation_curve_cache = {}  # {id(DataFrame): (weakref to it, settings, curves)}
+        self._mds_scatter = None  # Numeric-coloured MDS scatter on the canvas, updated in place by plot_mds
+        self._rdm_images = None  # (feature, target) images of the combined RDM figure, updated in place
         
         self.initUI()
         self.figure_data = {}
         self.current_figure_type = None
         self.excluded_participants = {}  # Change to dict to track per dataset
-        self.excluded_trials = {}  # Add to track excluded trials per dataset
+        self.excluded_trials = {}  # pd.Index of excluded trial indices per dataset
         self.datasets = {}  # Dictionary to store multiple datasets {name: {"data": DataFrame, "color": str}}
         self.dataset_colors = {}  # Store colors for each dataset
         self.dataset_patterns = {}  # Add this line to store patterns for datasets
@@ -167,6 +230,11 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         self.dataset_list.setSelectionMode(QListWidget.ExtendedSelection)
         self.dataset_list.setMinimumHeight(100)
         self.dataset_list.itemSelectionChanged.connect(self.on_dataset_selection_changed)
+        # Coalesce bursts of selection changes (e.g. shift-click or drag selecting) into one refresh
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(75)
+        self._refresh_timer.timeout.connect(self.refresh_selection_views)
     
         # Dataset buttons layout
         dataset_buttons = QHBoxLayout()
@@ -294,13 +362,13 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         analysis_layout.addWidget(self.coactivation_widget)
         analysis_layout.addWidget(self.pir_widget)
         analysis_layout.addWidget(self.mre_widget)
-        analysis_layout.addWidget(self.permutation_widget)
         self.use_permutation_test_checkbox = QCheckBox("Use permutation test for statistical validation", self)
         self.use_permutation_test_checkbox.setToolTip("When checked, a permutation test will be performed to assess statistical significance of race model violations")
         self.use_permutation_test_checkbox.setChecked(False)
         self.use_permutation_test_checkbox.stateChanged.connect(self.toggle_permutation_parameters)
         analysis_layout.addWidget(self.use_permutation_test_checkbox)
-        analysis_layout.addWidget(self.permutation_options_widget)
+        # One set of permutation inputs, shown for the Permutation Test model or when the checkbox is on
+        analysis_layout.addWidget(self.permutation_widget)
         self.more_info_button = QPushButton('Race Model Selection More Info', self)
         self.more_info_button.clicked.connect(self.show_more_info)
         analysis_layout.addWidget(self.more_info_button)
@@ -381,6 +449,12 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         scatter_button_layout.addWidget(self.sync_axes_checkbox)
         analysis_layout.addLayout(scatter_button_layout)
         
+        # Plot buttons that need at least one selected dataset
+        self.dataset_plot_buttons = (self.plot_mean_button, self.plot_median_button,
+                                     self.plot_boxplot_button, self.plot_distribution_button,
+                                     self.plot_race_model_button, self.plot_violations_button,
+                                     self.plot_scatter_button)
+        
         # MDS Controls
         mds_group = QGroupBox("Multidimensional Scaling (MDS)")
         mds_layout = QVBoxLayout(mds_group)
@@ -449,6 +523,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         right_layout.addWidget(self.save_figure_data_button)
         self.outlier_report = QTextEdit(self)
         self.outlier_report.setReadOnly(True)
+        self.outlier_report.setAcceptRichText(False)
         self.outlier_report.setMaximumHeight(100)
         self.outlier_report.setVisible(False)
         right_layout.addWidget(self.outlier_report)
@@ -469,25 +544,190 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         items = self.dataset_list.selectedItems()
         if items:
             ds = items[0].text()
-            df = self.datasets.get(ds, {}).get("data", None)
-            if df is not None:
-                violations = []
-                # Use current percentile‐slider range for CDF window
-                pct_lo = self.percentile_range_slider.first_position
-                pct_hi = self.percentile_range_slider.second_position
-                for p in df['participant_number'].unique():
-                    sub = df[df['participant_number'] == p]
-                    res = self.calculate_race_violation(sub,
-                                                        (pct_lo, pct_hi),
-                                                        self.per_participant_checkbox.isChecked())
-                    if res:
-                        violations.append(res[0])
-                if violations:
-                    mn, mx = min(violations), max(violations)
+            all_violations = self.get_dataset_violations(ds)
+            if all_violations is not None:
+                violations = all_violations[~np.isnan(all_violations)]
+                if violations.size:
+                    mn, mx = violations.min(), violations.max()
                     text += f'\nMinimum violation: {mn:.3f}   Maximum violation: {mx:.3f}'
-                    text += f'\nExcluding {len(df["participant_number"].unique()) - len(violations)} participants with invalid data'
+                    text += f'\nExcluding {len(all_violations) - len(violations)} participants with invalid data'
         
         self.violation_filter_label.setText(text)
+
+    def _race_model_key(self):
+        """Return the race model selection and parameters that calculate_race_violation depends on."""
+        return (self.model_selector.currentText(),
+                self.coactivation_mean_slider.value(), self.coactivation_std_slider.value(),
+                self.pir_interaction_slider.value(),
+                self.mre_alpha_slider.value(), self.mre_beta_slider.value(), self.mre_lambda_slider.value())
+
+    def get_dataset_violations(self, dataset_name):
+        """
+        Mean race model violation of every participant in a dataset for the current CDF window.
+        
+        The last result for each dataset is kept and reused while the dataset's DataFrame,
+        the percentile range and the race model settings are unchanged, so moving the
+        violation-range slider does not recompute it.
+        
+        Returns:
+        --------
+        numpy.ndarray or None
+            One value per participant (NaN for participants with invalid data),
+            or None if the dataset is not loaded
+        """
+        df = self.datasets.get(dataset_name, {}).get("data", None)
+        if df is None:
+            return None
+        percentile_range = (self.percentile_range_slider.first_position,
+                            self.percentile_range_slider.second_position)
+        per_participant = self.per_participant_checkbox.isChecked()
+        key = ("violations", dataset_name)
+        settings = (percentile_range, per_participant, self._race_model_key())
+        cached = self._violation_cache.get(key)
+        if cached is not None and cached[0] is df and cached[1] == settings:
+            return cached[2]
+        
+        violations = self.calculate_participant_violations(df, percentile_range, per_participant)
+        self._violation_cache[key] = (df, settings, violations)
+        return violations
+
+    def calculate_participant_violations(self, df, percentile_range, per_participant=True,
+                                         cumulative=False):
+        """
+        Mean race model violation of each participant, computed in one grouped pass.
+        
+        Equivalent to calling calculate_race_violation on each participant's rows separately,
+        but the data is split into participant groups once and the ECDFs of all participants
+        are evaluated together on their own RT grids. With cumulative=True the positive
+        violations in the window are summed instead, as in get_participant_violation_value.
+        
+        Returns:
+        --------
+        numpy.ndarray
+            One value per participant in order of appearance (NaN where the violation is undefined)
+        """
+        n_participants, valid, curves = self._violation_curves(df, per_participant)
+        violations = np.full(n_participants, np.nan)
+        if curves is None:
+            return violations
+        
+        # Same percentile window as calculate_race_violation
+        lower_idx = int(curves.shape[1] * percentile_range[0] / 100)
+        upper_idx = int(curves.shape[1] * percentile_range[1] / 100)
+        window = curves[:, lower_idx:upper_idx]
+        violations[valid] = window.sum(axis=1) if cumulative else window.mean(axis=1)
+        return violations
+
+    def _violation_curves(self, df, per_participant):
+        """
+        Positive race model violation curve, max(ECDF_AV - race model, 0), of each participant.
+        
+        The curves do not depend on the CDF percentile window, so the last curves of each
+        DataFrame (by identity) are cached with the pooling mode and race model settings they
+        were computed for, and moving the percentile slider only re-slices them. Entries hold
+        a weak reference and are dropped when their DataFrame is garbage collected.
+        
+        Returns:
+        --------
+        tuple
+            (n_participants, valid, curves): valid flags the participants in order of appearance
+            that have a curve, and curves holds their (n_valid, 500) violations, or is None when
+            no participant has one
+        """
+        key = id(df)
+        settings = (per_participant, self._race_model_key())
+        cached = self._violation_curve_cache.get(key)
+        if cached is not None and cached[0]() is df and cached[1] == settings:
+            return cached[2]
+        
+        result = self._compute_violation_curves(df, per_participant)
+        cache = self._violation_curve_cache
+        self._violation_curve_cache[key] = (weakref.ref(df, lambda _, key=key: cache.pop(key, None)),
+                                            settings, result)
+        return result
+
+    def _compute_violation_curves(self, df, per_participant):
+        """Uncached body of _violation_curves."""
+        participant_idx, participants = pd.factorize(df['participant_number'])
+        n_participants = len(participants)
+        rts = df['reaction_time'].to_numpy(dtype=np.float64)
+        modalities = df['modality'].to_numpy()
+        if n_participants == 0:
+            return n_participants, None, None
+        
+        # Each participant's grid spans its own RT range (all trials, or the three modalities when pooled)
+        in_range = participant_idx >= 0
+        if not per_participant:
+            in_range &= np.isin(modalities, (1, 2, 3))
+        in_range &= ~np.isnan(rts)
+        lo = np.full(n_participants, np.inf)
+        hi = np.full(n_participants, -np.inf)
+        np.fmin.at(lo, participant_idx[in_range], rts[in_range])
+        np.fmax.at(hi, participant_idx[in_range], rts[in_range])
+        has_range = np.isfinite(lo)
+        lo[~has_range] = hi[~has_range] = 0.0
+        grids = np.linspace(lo, hi, 500, axis=1)
+        
+        ecdfs, counts = modality_ecdfs(rts, modalities, participant_idx, n_participants, grids)
+        if per_participant:
+            valid = (counts >= 2).all(axis=0) & has_range
+        else:
+            valid = (counts >= 1).all(axis=0) & has_range & (lo != hi)
+        if not valid.any():
+            return n_participants, valid, None
+        
+        ecdf_a, ecdf_v, ecdf_av = ecdfs[:, valid]
+        race_model = self._calculate_race_model(ecdf_a, ecdf_v, grids[valid])
+        if race_model is None:
+            return n_participants, valid, None
+        return n_participants, valid, np.maximum(ecdf_av - race_model, 0)
+
+    def participant_violation_values(self, data, percentile_range):
+        """
+        Cumulative race model violation of every participant in data.
+        
+        Batched equivalent of calling get_participant_violation_value per participant.
+        
+        Returns:
+        --------
+        pandas.Series
+            Violation value indexed by participant number, NaN where it is undefined
+        """
+        participants = pd.factorize(data['participant_number'])[1]
+        values = self.calculate_participant_violations(data, percentile_range,
+                                                       self.per_participant_checkbox.isChecked(),
+                                                       cumulative=True)
+        return pd.Series(values, index=participants)
+
+    def get_violation_values(self, dataset_name, percentile_range, filtered=True):
+        """
+        Cached participant_violation_values for a dataset.
+        
+        With filtered=True the values are computed on get_filtered_data(dataset_name), which
+        returns the same DataFrame object for as long as its inputs are unchanged. As in
+        get_dataset_violations, only the last result per dataset and filtering is kept, and it
+        is reused only while the DataFrame it was computed from is that same object.
+        
+        Returns:
+        --------
+        pandas.Series or None
+            Violation value indexed by participant number, or None if there is no data
+        """
+        df = self.datasets.get(dataset_name, {}).get("data", None)
+        if df is None:
+            return None
+        data = self.get_filtered_data(dataset_name) if filtered else df
+        if data is None:
+            return None
+        key = ("values", dataset_name, filtered)
+        settings = (percentile_range, self.per_participant_checkbox.isChecked(), self._race_model_key())
+        cached = self._violation_cache.get(key)
+        if cached is not None and cached[0] is data and cached[1] == settings:
+            return cached[2]
+        
+        values = self.participant_violation_values(data, percentile_range)
+        self._violation_cache[key] = (data, settings, values)
+        return values
         
     def create_model_parameter_widgets(self):
         # Coactivation Model parameters
@@ -576,38 +816,6 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         self.pir_widget.setVisible(False)
         self.mre_widget.setVisible(False)
         self.permutation_widget.setVisible(False)
-        
-        # Create a checkbox for permutation test that can be used with any model
-        self.use_permutation_test_checkbox = QCheckBox("Use permutation test for statistical validation")
-        self.use_permutation_test_checkbox.setToolTip(
-            "When checked, a permutation test will be performed to assess statistical significance of race model violations")
-        self.use_permutation_test_checkbox.setChecked(False)
-        self.use_permutation_test_checkbox.stateChanged.connect(self.toggle_permutation_parameters)
-        
-        # Create a widget for permutation parameters that can be shown/hidden
-        self.permutation_options_widget = QWidget(self)
-        perm_options_layout = QVBoxLayout(self.permutation_options_widget)
-        perm_options_layout.setContentsMargins(10, 0, 0, 0)  # Add left indent
-        
-        # Copy the permutation parameters to this widget
-        num_perm_layout2 = QHBoxLayout()
-        num_perm_label2 = QLabel("Number of permutations:")
-        self.num_permutations_input2 = QLineEdit("1000")
-        self.num_permutations_input2.setToolTip("Higher values provide more accurate p-values but take longer to compute")
-        num_perm_layout2.addWidget(num_perm_label2)
-        num_perm_layout2.addWidget(self.num_permutations_input2)
-        
-        alpha_layout2 = QHBoxLayout()
-        alpha_label2 = QLabel("Significance level (α):")
-        self.alpha_threshold_input2 = QLineEdit("0.05")
-        alpha_layout2.addWidget(alpha_label2)
-        alpha_layout2.addWidget(self.alpha_threshold_input2)
-        
-        perm_options_layout.addLayout(num_perm_layout2)
-        perm_options_layout.addLayout(alpha_layout2)
-        
-        # Initially hide permutation options
-        self.permutation_options_widget.setVisible(False)
 
     def update_participant_settings(self):
         participant = self.participant_selector.currentText()
@@ -633,7 +841,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             return
             
         # Work with the selected dataset's data
-        current_data = self.datasets[dataset_name]["data"].copy()
+        current_data = self.datasets[dataset_name]["data"]
     
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Exclude Trials - {dataset_name}")
@@ -663,6 +871,11 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         zscore_input.setPlaceholderText("e.g., 2.5")
         criteria_layout.addRow("Z-score threshold:", zscore_input)
     
+        # Modified z-score (median absolute deviation) threshold
+        mad_input = QLineEdit()
+        mad_input.setPlaceholderText("e.g., 3.5")
+        criteria_layout.addRow("Modified z-score (MAD) threshold:", mad_input)
+    
         # Percentage from median
         percent_input = QLineEdit()
         percent_input.setPlaceholderText("e.g., 50")
@@ -694,6 +907,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         # Results text area
         results_text = QTextEdit()
         results_text.setReadOnly(True)
+        results_text.setAcceptRichText(False)
         dialog_layout.addWidget(results_text)
     
         # Button box
@@ -711,23 +925,24 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                 zscore_input.text(),
                 percent_input.text(),
                 [audio_check.isChecked(), visual_check.isChecked(), av_check.isChecked()],
-                current_data
+                current_data,
+                mad_thresh=mad_input.text()
             )
             
-            summary = "Preview of trials to be excluded:\n\n"
+            lines = ["Preview of trials to be excluded:", ""]
             total_excluded = 0
             
+            trial_counts = current_data['participant_number'].value_counts()
             for participant, exclusions in trials_to_exclude.items():
                 if exclusions:
                     n_excluded = len(exclusions)
                     total_excluded += n_excluded
-                    participant_data = current_data[current_data['participant_number'] == participant]
-                    total_trials = len(participant_data)
-                    summary += f"Participant {participant}: {n_excluded} of {total_trials} trials "
-                    summary += f"({(n_excluded/total_trials*100):.1f}%)\n"
+                    total_trials = trial_counts[participant]
+                    lines.append(f"Participant {participant}: {n_excluded} of {total_trials} trials "
+                                 f"({(n_excluded/total_trials*100):.1f}%)")
             
-            summary += f"\nTotal trials to be excluded: {total_excluded}"
-            results_text.setText(summary)
+            lines += ["", f"Total trials to be excluded: {total_excluded}"]
+            results_text.setPlainText("\n".join(lines))
             
             apply_button.setEnabled(total_excluded > 0)
     
@@ -738,7 +953,8 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                 zscore_input.text(),
                 percent_input.text(),
                 [audio_check.isChecked(), visual_check.isChecked(), av_check.isChecked()],
-                current_data
+                current_data,
+                mad_thresh=mad_input.text()
             )
             
             all_indices = []
@@ -746,12 +962,14 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                 all_indices.extend(participant_indices)
             
             if all_indices:
-                if dataset_name not in self.excluded_trials:
-                    self.excluded_trials[dataset_name] = []
-                self.excluded_trials[dataset_name].extend(all_indices)
+                excluded_trials = self.excluded_trials.get(dataset_name, pd.Index([], dtype='int64'))
+                self.excluded_trials[dataset_name] = excluded_trials.union(pd.Index(all_indices))
     
-                updated_data = current_data.drop(all_indices).reset_index(drop=True)
+                updated_data = current_data[~current_data.index.isin(all_indices)].reset_index(drop=True)
                 self.datasets[dataset_name]["data"] = updated_data
+                self.datasets[dataset_name]["soa"] = self._build_soa_cache(updated_data)
+                self.datasets[dataset_name]["gb"] = self._group_participants(updated_data)
+                self._violation_cache.clear()
     
                 QMessageBox.information(dialog, "Success", 
                                     f"Successfully excluded {len(all_indices)} trials from {dataset_name}")
@@ -774,18 +992,9 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         self.coactivation_widget.setVisible(selected_model == "Coactivation Model")
         self.pir_widget.setVisible(selected_model == "Parallel Interactive Race Model")
         self.mre_widget.setVisible(selected_model == "Multisensory Response Enhancement Model")
-        self.permutation_widget.setVisible(selected_model == "Permutation Test")
-        
-        # If model selection is no longer "Permutation Test", but the checkbox is checked,
-        # keep permutation options visible
-        if selected_model != "Permutation Test" and self.use_permutation_test_checkbox.isChecked():
-            self.permutation_options_widget.setVisible(True)
-
-    def update_participant_settings(self):
-        participant = self.participant_selector.currentText()
-        self.exclude_participants_button.setVisible(participant == "All Participants")
-        self.exclude_trials_button.setVisible(True)
-        self.undo_exclusions_button.setVisible(True)
+        # Keep the permutation parameters visible for any model while the checkbox is checked
+        self.permutation_widget.setVisible(selected_model == "Permutation Test" or
+                                           self.use_permutation_test_checkbox.isChecked())
 
 
     def handle_outlier_exclusion(self, *args):
@@ -828,62 +1037,55 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     getattr(self, f'plot_{self.current_figure_type}')()
 
     def exclude_outliers(self, z_score_threshold):
-        total_excluded = 0
-        participant_outliers = {}
-        
         if self.participant_selector.currentText() == "All Participants":
             excluded_participants = self.get_excluded_participants()
             participants = [p for p in self.data['participant_number'].unique() 
                         if str(p) not in excluded_participants]
         else:
             participant_number = self.participant_selector.currentText().split()[-1]
-            participants = [participant_number]
-        
-        for participant in participants:
-            participant_data = self.data[self.data['participant_number'] == participant]
-            outlier_indices = []
-            modality_outliers = {}
-            
-            for modality in [1, 2, 3]:  # Audio, Visual, Audiovisual
-                modality_data = participant_data[participant_data['modality'] == modality]
-                z_scores = np.abs(scipy.stats.zscore(modality_data['reaction_time']))
-                modality_outliers[modality] = len(z_scores[z_scores >= z_score_threshold])
-                outlier_indices.extend(modality_data.index[z_scores >= z_score_threshold].tolist())
-            
-            if outlier_indices:
-                participant_outliers[participant] = {
-                    'total': len(outlier_indices),
-                    'audio': modality_outliers[1],
-                    'visual': modality_outliers[2],
-                    'audiovisual': modality_outliers[3]
-                }
-                total_excluded += len(outlier_indices)
-                self.data = self.data.drop(outlier_indices).reset_index(drop=True)
+            participants = [int(participant_number)]
+        
+        # z-score every Audio/Visual/Audiovisual group at once (population SD, as scipy.stats.zscore)
+        subset = self.data[self.data['participant_number'].isin(participants) &
+                           self.data['modality'].isin([1, 2, 3])]
+        rts = subset['reaction_time']
+        keys = [subset['participant_number'], subset['modality']]
+        groups = rts.groupby(keys, sort=False)
+        z_scores = (rts - groups.transform('mean')).abs() / groups.transform('std', ddof=0)
+        is_outlier = z_scores >= z_score_threshold
+        
+        # Outlier counts per participant (rows) and modality (columns)
+        participant_outliers = is_outlier.groupby(keys).sum().unstack('modality', fill_value=0)
+        participant_outliers = participant_outliers.reindex(columns=[1, 2, 3], fill_value=0)
+        participant_outliers = participant_outliers[participant_outliers.sum(axis=1) > 0]
+        total_excluded = int(is_outlier.sum())
+        self.data = self.data.drop(subset.index[is_outlier]).reset_index(drop=True)
         
         # Create detailed message about outlier removal
-        message = "Outlier Removal Summary:\n"
-        message += f"Criteria: Trials with |z-score| > {z_score_threshold} within each modality\n\n"
-        
-        if participant_outliers:
-            for participant, stats in participant_outliers.items():
-                message += f"Participant {participant}:\n"
-                message += f"- Audio: {stats['audio']} trials\n"
-                message += f"- Visual: {stats['visual']} trials\n"
-                message += f"- Audiovisual: {stats['audiovisual']} trials\n"
-                message += f"- Total: {stats['total']} trials\n\n"
-            message += f"Total trials removed across all participants: {total_excluded}"
+        lines = ["Outlier Removal Summary:",
+                 f"Criteria: Trials with |z-score| > {z_score_threshold} within each modality", ""]
+        
+        if not participant_outliers.empty:
+            for participant, counts in participant_outliers.iterrows():
+                lines += [f"Participant {participant}:",
+                          f"- Audio: {counts[1]} trials",
+                          f"- Visual: {counts[2]} trials",
+                          f"- Audiovisual: {counts[3]} trials",
+                          f"- Total: {counts.sum()} trials", ""]
+            lines.append(f"Total trials removed across all participants: {total_excluded}")
+            message = "\n".join(lines)
         else:
             message = "No outliers were detected using the current criteria."
         
         # Update the outlier report
         self.outlier_report.setVisible(True)
-        self.outlier_report.setText(message)
+        self.outlier_report.setPlainText(message)
         
         # Show a small notification
         self.statusBar().showMessage(f"Excluded {total_excluded} outlier trials", 5000)
 
     def find_trials_to_exclude(self, rt_min, rt_max, zscore_thresh, percent_deviation, 
-                              modalities_enabled, data):
+                              modalities_enabled, data, mad_thresh=None):
         """
         Find trials to exclude based on given criteria.
         
@@ -901,6 +1103,9 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             List of boolean flags for each modality [audio, visual, audiovisual]
         data : pandas.DataFrame
             Dataset to analyze
+        mad_thresh : str, optional
+            Modified z-score threshold, 0.6745 * |RT - median| / MAD (Iglewicz & Hoaglin;
+            3.5 is the usual cut-off for reaction times)
         
         Returns:
         --------
@@ -927,6 +1132,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             rt_max = float(rt_max) if rt_max else None
             zscore_thresh = float(zscore_thresh) if zscore_thresh else None
             percent_dev = float(percent_deviation) if percent_deviation else None
+            mad_thresh = float(mad_thresh) if mad_thresh else None
         except ValueError:
             QMessageBox.warning(None, "Invalid Input", 
                             "Please enter valid numbers for the criteria.")
@@ -941,40 +1147,45 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                             "Please select at least one modality.")
             return {}
     
-        for participant in participants:
-            participant_data = data[data['participant_number'] == participant]
-            exclusion_indices = []
+        # Evaluate every criterion for all participant/modality groups at once
+        subset = data[data['participant_number'].isin(participants) &
+                      data['modality'].isin(selected_modalities)]
+        rts = subset['reaction_time']
+        groups = rts.groupby([subset['participant_number'], subset['modality']], sort=False)
+        exclude = pd.Series(False, index=subset.index)
+        
+        # RT range criteria
+        if rt_min is not None:
+            exclude |= rts < rt_min
+        if rt_max is not None:
+            exclude |= rts > rt_max
+        
+        # Z-score criteria (population SD, as scipy.stats.zscore)
+        if zscore_thresh is not None:
+            z_scores = (rts - groups.transform('mean')).abs() / groups.transform('std', ddof=0)
+            exclude |= (groups.transform('size') > 1) & (z_scores > zscore_thresh)
+        
+        if percent_dev is not None or mad_thresh is not None:
+            median_rt = groups.transform('median')
+            abs_dev = (rts - median_rt).abs()
             
-            for modality in selected_modalities:
-                modality_data = participant_data[participant_data['modality'] == modality]
-                
-                if len(modality_data) == 0:
-                    continue
-                
-                # RT range criteria
-                if rt_min is not None:
-                    exclusion_indices.extend(
-                        modality_data[modality_data['reaction_time'] < rt_min].index.tolist())
-                if rt_max is not None:
-                    exclusion_indices.extend(
-                        modality_data[modality_data['reaction_time'] > rt_max].index.tolist())
-                
-                # Z-score criteria
-                if zscore_thresh is not None and len(modality_data) > 1:
-                    z_scores = np.abs(stats.zscore(modality_data['reaction_time']))
-                    exclusion_indices.extend(
-                        modality_data[z_scores > zscore_thresh].index.tolist())
-                
-                # Percentage deviation from median criteria
-                if percent_dev is not None:
-                    median_rt = modality_data['reaction_time'].median()
-                    deviation = np.abs(modality_data['reaction_time'] - median_rt) / median_rt * 100
-                    exclusion_indices.extend(
-                        modality_data[deviation > percent_dev].index.tolist())
+            # Percentage deviation from median criteria
+            if percent_dev is not None:
+                exclude |= abs_dev / median_rt * 100 > percent_dev
             
-            # Store unique indices for this participant
-            if exclusion_indices:
-                trials_to_exclude[participant] = list(set(exclusion_indices))
+            # Modified z-score criteria
+            if mad_thresh is not None:
+                dev_groups = abs_dev.groupby([subset['participant_number'], subset['modality']], sort=False)
+                mad = dev_groups.transform('median')
+                # MAD is 0 when half or more of the trials tie at the median; scale by the
+                # mean absolute deviation then (a constant group has no outliers either way)
+                modified_z = (0.6745 * abs_dev / mad).where(
+                    mad > 0, abs_dev / (1.253314 * dev_groups.transform('mean')))
+                exclude |= modified_z > mad_thresh
+        
+        excluded = subset.loc[exclude, 'participant_number']
+        for participant, indices in excluded.groupby(excluded, sort=False).groups.items():
+            trials_to_exclude[participant] = list(indices)
         
         return trials_to_exclude
 
@@ -986,11 +1197,8 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             self.data = self.original_data.copy()
 
             # Exclude participants with incomplete modality data
-            participants_to_exclude = []
-            for participant in self.data['participant_number'].unique():
-                participant_data = self.data[self.data['participant_number'] == participant]
-                if len(participant_data['modality'].unique()) < 3:
-                    participants_to_exclude.append(participant)
+            n_modalities = self.data.groupby('participant_number', sort=False)['modality'].nunique()
+            participants_to_exclude = n_modalities.index[n_modalities < 3].tolist()
 
             # Filter out excluded participants
             if participants_to_exclude:
@@ -1001,18 +1209,76 @@ class ReactionTimeAnalysisGUI(QMainWindow):
 
             # Update participant selector after filtering
             self.statusBar().showMessage('Data loaded successfully!', 5000)
-            self.participant_selector.clear()
-            self.participant_selector.addItem("All Participants")
             participants = self.data['participant_number'].unique()
-            for participant in participants:
-                self.participant_selector.addItem(f"Participant {participant}")
+            self.set_participant_selector_items([f"Participant {participant}" for participant in participants])
             self.excluded_participants = []  # Reset excluded participants when new data is loaded
 
+    def _compact_dtypes(self, df):
+        """
+        Store integer modality and participant codes in the smallest integer dtype that holds them.
+        
+        The modality and participant masks scattered through the plots then compare one or two
+        bytes per row instead of eight. Columns that are not integer-typed (e.g. string
+        participant IDs) are left as they are.
+        """
+        for column in ('modality', 'participant_number'):
+            if column in df.columns and pd.api.types.is_integer_dtype(df[column]):
+                df[column] = pd.to_numeric(df[column], downcast='integer')
+        return df
+
+    def _build_soa_cache(self, df):
+        """
+        Split a dataset into contiguous float32 reaction time arrays per participant and modality.
+        
+        Built in one groupby pass whenever a dataset's data is replaced, so per-participant
+        consumers can read {participant: {'audio': ..., 'visual': ..., 'av': ...}} directly
+        instead of re-masking the DataFrame. Millisecond reaction times need far fewer than
+        float32's ~7 significant digits, so the cache is stored at half the size of the
+        float64 DataFrame column, which stays the source for the reported statistics.
+        Statistics taken from the cache must upcast to float64 first.
+        """
+        soa = {}
+        grouped = df.groupby(['participant_number', 'modality'], sort=False)['reaction_time']
+        for (participant, modality), rts in grouped:
+            key = SOA_MODALITY_KEYS.get(modality)
+            if key is not None:
+                soa.setdefault(participant, {})[key] = np.ascontiguousarray(rts.to_numpy(), dtype=np.float32)
+        return soa
+
+    def _group_participants(self, df):
+        """
+        Group a dataset's rows by participant, in order of first appearance.
+        
+        Stored as self.datasets[name]['gb'] next to the SoA cache and rebuilt whenever the
+        dataset's data is replaced. pandas builds the group indexer once on first use, so
+        iterating `for participant, rows in gb` is a single hash pass over the frame rather
+        than one boolean mask per participant.
+        """
+        return df.groupby('participant_number', sort=False)
+
     def get_filtered_data(self, dataset_name=None):
-        """Get filtered data based on current selection and exclusions"""
+        """
+        Get filtered data based on current selection and exclusions.
+        
+        The result is memoized per dataset and returned as long as the dataset's DataFrame,
+        its excluded trials and participants and the participant selection are unchanged, so
+        repeated plot and slider updates share one filtered frame. Callers must copy it
+        before modifying it.
+        """
         try:
             if dataset_name and dataset_name in self.datasets:
-                data = self.datasets[dataset_name]["data"].copy()
+                source = self.datasets[dataset_name]["data"]
+                excluded_trials = self.excluded_trials.get(dataset_name)
+                excluded_parts = self.excluded_participants.get(dataset_name)
+                inputs = (source, excluded_trials,
+                          None if excluded_parts is None else tuple(sorted(map(repr, excluded_parts))),
+                          self.participant_selector.currentText())
+                cached = self._filtered_data_cache.get(dataset_name)
+                if (cached is not None and cached[0][0] is source and cached[0][1] is excluded_trials
+                        and cached[0][2:] == inputs[2:]):
+                    return cached[1]
+                
+                data = source.copy()
                 
                 # Apply participant exclusions
                 if dataset_name in self.excluded_participants:
@@ -1022,9 +1288,8 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                 # Apply trial exclusions
                 if (dataset_name in self.excluded_trials):
                     excluded_trials = self.excluded_trials[dataset_name]
-                    valid_indices = [idx for idx in excluded_trials if idx in data.index]
-                    if valid_indices:
-                        data = data.drop(valid_indices)
+                    if len(excluded_trials):
+                        data = data.loc[data.index.difference(excluded_trials, sort=False)]
                     data = data.reset_index(drop=True)
                 
                 # Apply participant filter
@@ -1032,6 +1297,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     participant_number = int(self.participant_selector.currentText().split()[-1])
                     data = data[data['participant_number'] == participant_number]
                 
+                self._filtered_data_cache[dataset_name] = (inputs, data)
                 return data
                 
             # Return data for first selected dataset if no specific dataset provided
@@ -1055,6 +1321,9 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     del self.excluded_participants[name]
                 if name in self.excluded_trials:
                     del self.excluded_trials[name]
+                self._filtered_data_cache.pop(name, None)
+                for statistic in ('mean', 'median'):
+                    self._rt_summary_cache.pop((name, statistic), None)
                 if name in self.dataset_colors:
                     del self.dataset_colors[name]
                 self.dataset_list.takeItem(self.dataset_list.row(item))
@@ -1068,17 +1337,22 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         
         # Enable/disable plotting buttons based on selection
         has_selection = len(selected_items) > 0
-        for button in [self.plot_mean_button, self.plot_median_button, 
-                      self.plot_boxplot_button, self.plot_distribution_button,
-                      self.plot_race_model_button, self.plot_violations_button,
-                      self.plot_scatter_button]:
-            button.setEnabled(has_selection)
+        if self.plot_mean_button.isEnabled() != has_selection:
+            for button in self.dataset_plot_buttons:
+                button.setEnabled(has_selection)
+        
+        # The participant list, violation slider and plot are refreshed once the selection settles
+        self._refresh_timer.start()
+
+    def refresh_selection_views(self):
+        """Update the participant selector, violation slider range and current plot for the dataset selection."""
+        self._refresh_timer.stop()
         
         # Update participant selector
         self.update_participant_selector()
         
         # Update violation slider range based on selected datasets
-        if has_selection:
+        if self.dataset_list.selectedItems():
             self.update_violation_slider_range()
         
         # Update any current plots if they exist
@@ -1102,9 +1376,8 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             The race model violation value (cumulative sum of positive violations)
         """
         # Ensure all modalities exist
-        for mod in [1, 2, 3]:
-            if not (participant_data['modality'] == mod).any():
-                return None
+        if not {1, 2, 3}.issubset(participant_data['modality'].unique()):
+            return None
                 
         result = self.calculate_race_violation(participant_data, percentile_range, 
                                               self.per_participant_checkbox.isChecked())
@@ -1116,9 +1389,10 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         lower_idx = int(len(common_rts) * percentile_range[0] / 100)
         upper_idx = int(len(common_rts) * percentile_range[1] / 100)
         
-        # Sum positive violations within the specified range
-        cumulative_violation = np.sum(np.maximum(ecdf_av[lower_idx:upper_idx] - race_model[lower_idx:upper_idx], 0))
-        return cumulative_violation
+        # Sum positive violations within the specified range, clipping the difference in place
+        difference = ecdf_av[lower_idx:upper_idx] - race_model[lower_idx:upper_idx]
+        np.maximum(difference, 0, out=difference)
+        return difference.sum()
     def update_violation_slider_range(self):
         """
         Calculate min and max violation values across participants in selected datasets
@@ -1128,28 +1402,19 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         if not selected_items:
             return
         
-        min_violation = float('inf')
-        max_violation = float('-inf')
-        
         # Get current percentile range for CDF window
         percentile_range = (self.percentile_range_slider.first_position, 
                            self.percentile_range_slider.second_position)
         
-        for item in selected_items:
-            dataset_name = item.text()
-            data = self.get_filtered_data(dataset_name)
-            if data is None:
-                continue
-            
-            for participant in data['participant_number'].unique():
-                participant_data = data[data['participant_number'] == participant]
-                viol_val = self.get_participant_violation_value(participant_data, percentile_range)
-                if viol_val is not None:
-                    min_violation = min(min_violation, viol_val)
-                    max_violation = max(max_violation, viol_val)
+        per_dataset = [self.get_violation_values(item.text(), percentile_range) for item in selected_items]
+        values = np.concatenate([np.empty(0)] + [v.to_numpy(dtype=np.float64) for v in per_dataset
+                                                 if v is not None])
+        values = values[~np.isnan(values)]
         
         # Only update slider if we found valid values
-        if min_violation != float('inf') and max_violation != float('-inf'):
+        if values.size:
+            min_violation = float(values.min())
+            max_violation = float(values.max())
             # Add small padding to ensure values at min/max are included
             padding = (max_violation - min_violation) * 0.05
             min_violation = max(min_violation - padding, 0)  # Ensure non-negative
@@ -1163,50 +1428,81 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             # Force update of the label
             self.update_violation_filter_label(min_violation, max_violation)
 
+    def set_participant_selector_items(self, entries):
+        """
+        Replace the participant selector's entries with "All Participants" followed by entries.
+        
+        Signals are blocked while the list is rebuilt, so currentIndexChanged fires once for
+        the new selection instead of once for the clear and again for the first item.
+        """
+        self.participant_selector.blockSignals(True)
+        self.participant_selector.clear()
+        self.participant_selector.addItems(["All Participants"] + list(entries))
+        self.participant_selector.blockSignals(False)
+        self.participant_selector.currentIndexChanged.emit(self.participant_selector.currentIndex())
+
     def update_participant_selector(self):
         """Update participant selector based on selected datasets"""
-        self.participant_selector.clear()
-        self.participant_selector.addItem("All Participants")
-        
+        entries = []
         selected_items = self.dataset_list.selectedItems()
         if selected_items:
-            all_participants = set()
-            for item in selected_items:
-                dataset_name = item.text()
-                if dataset_name in self.datasets:
-                    data = self.datasets[dataset_name]["data"]
+            names = tuple(item.text() for item in selected_items if item.text() in self.datasets)
+            frames = tuple(self.datasets[name]["data"] for name in names)
+            cached = self._participant_items
+            # Reuse the sorted entries while the same datasets are selected and their data is unchanged
+            if (cached is not None and cached[0] == names and
+                    all(a is b for a, b in zip(cached[1], frames))):
+                entries = cached[2]
+            else:
+                all_participants = set()
+                for dataset_name, data in zip(names, frames):
                     if "participant_number" in data.columns:
                         participants = set(str(p) for p in data["participant_number"].unique())
                         all_participants.update(participants)
                     else:
                         print(f"Warning: Dataset '{dataset_name}' missing 'participant_number' column. Skipping.")
-            # Natural sort
-            def natural_sort_key(s):
-                import re
-                convert = lambda text: int(text) if text.isdigit() else text.lower()
-                return [convert(c) for c in re.split('([0-9]+)', str(s))]
-                
-            for participant in sorted(list(all_participants), key=natural_sort_key):
-                self.participant_selector.addItem(f"Participant {participant}")
+                entries = [f"Participant {participant}" for participant in
+                           sorted(all_participants, key=natural_sort_key)]
+                self._participant_items = (names, frames, entries)
+        self.set_participant_selector_items(entries)
                     
         self.exclude_participants_button.setVisible(True)
         self.exclude_trials_button.setVisible(True)
         self.undo_exclusions_button.setVisible(True)
 
     def calculate_mean_rt(self, data):
-        mean_rt = data.groupby('modality')['reaction_time'].mean()
-        std_error = data.groupby('modality')['reaction_time'].sem()
+        grouped = data.groupby('modality')['reaction_time']
+        mean_rt = grouped.mean()
+        std_error = grouped.sem()
         return mean_rt, std_error
 
     def calculate_median_rt(self, data):
-        median_rt = data.groupby('modality')['reaction_time'].median()
-        std_error = data.groupby('modality')['reaction_time'].apply(stats.sem)
+        grouped = data.groupby('modality')['reaction_time']
+        median_rt = grouped.median()
+        std_error = grouped.apply(stats.sem)
         return median_rt, std_error
 
+    def rt_summary(self, dataset_name, data, statistic):
+        """
+        calculate_mean_rt or calculate_median_rt (statistic 'mean' or 'median') of a dataset's
+        filtered data, memoized while get_filtered_data keeps returning the same DataFrame.
+        """
+        cached = self._rt_summary_cache.get((dataset_name, statistic))
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        summary = self.calculate_mean_rt(data) if statistic == 'mean' else self.calculate_median_rt(data)
+        self._rt_summary_cache[dataset_name, statistic] = (data, summary)
+        return summary
+
     def draw_significance_brackets(self, ax, x1, x2, y, p_value=None, bf10=None, 
-                                 is_between_datasets=False, bracket_level=0):
-        """Draw significance brackets with statistics"""
-        bar_width = 0.8 / len(self.dataset_list.selectedItems())
+                                 is_between_datasets=False, bracket_level=0, bar_width=None):
+        """Draw significance brackets with statistics.
+
+        bar_width is the width of one dataset's bar; callers drawing many brackets pass the
+        value they laid the bars out with, otherwise it is derived from the dataset selection.
+        """
+        if bar_width is None:
+            bar_width = 0.8 / len(self.dataset_list.selectedItems())
         base_gap = bar_width * 0.15  # Reduced from 0.2
         
         # Adjust height based on bracket level with tighter spacing
@@ -1319,89 +1615,81 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         if not mds_features:
             return
     
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        self.current_figure_type = 'mds'
-    
-        all_participant_data = []
-        all_participant_ids = []
-        all_dataset_names = []
-        all_feature_values = []  # Stores either dataset color or a numeric value (e.g. Age)
+        color_label = self.mds_color_feature.currentText()
+        # Per-dataset blocks of the kept participants' features, dataset names and numeric colours
+        feature_blocks = []
+        name_blocks = []
+        color_blocks = []
     
         for item in selected_items:
             dataset_name = item.text()
             data = self.get_filtered_data(dataset_name)
             if data is None:
                 continue
-            participants = data['participant_number'].unique()
-            for participant in participants:
-                participant_data = data[data['participant_number'] == participant]
-                features = []
-                for feat in mds_features:
-                    value = self.get_factor_value(participant_data, feat, (0, 100))
-                    try:
-                        f_val = float(value)
-                    except (ValueError, TypeError):
-                        f_val = np.nan
-                    features.append(f_val)
-                # Duplicate feature if only one is selected so we have 2D data for MDS
-                if len(features) == 1:
-                    features = features * 2
-                if any(np.isnan(features)):
-                    continue
-    
-                # Determine the color value based on mds_color_feature selection
-                color_choice = self.mds_color_feature.currentText()
-                if color_choice == "Dataset":
-                    color_value = self.datasets[dataset_name]["color"] if dataset_name in self.datasets else 'black'
-                elif color_choice == "Age":
-                    age_val = self.get_factor_value(participant_data, "Age", (0, 100))
-                    if age_val is None:
-                        continue
-                    # Get current age filter from the slider
-                    lo_age = self.mds_age_slider.first_position
-                    hi_age = self.mds_age_slider.second_position
-                    # Only include participant if Age is within the slider range
-                    if not (lo_age <= float(age_val) <= hi_age):
-                        continue
-                    color_value = float(age_val)
+            table = self.participant_feature_table(
+                data, mds_features + ([] if color_label == "Dataset" else [color_label]), (0, 100))
+            # Duplicates the feature if only one is selected so we have 2D data for MDS
+            feature_matrix = self._feature_matrix(table, mds_features)
+            keep = np.isfinite(feature_matrix).all(axis=1)
+            if color_label == "Dataset":
+                colors = np.empty(len(table))
+            else:
+                colors = table[color_label].map(_as_float).to_numpy(dtype=np.float64)
+                if color_label == "Age":
+                    # Only include participants whose Age is within the slider range
+                    keep &= (colors >= self.mds_age_slider.first_position) & (colors <= self.mds_age_slider.second_position)
                 else:
-                    # Custom numeric column case
-                    custom_val = self.get_factor_value(participant_data, color_choice, (0, 100))
-                    if custom_val is None:
-                        continue
-                    color_value = float(custom_val)
-    
-                all_participant_data.append(features)
-                all_participant_ids.append(participant)
-                all_dataset_names.append(dataset_name)
-                all_feature_values.append(color_value)
-    
-        if not all_participant_data:
+                    # Custom column: skip participants without a numeric value
+                    keep &= ~np.isnan(colors)
+            feature_blocks.append(feature_matrix[keep])
+            name_blocks.append(np.full(np.count_nonzero(keep), dataset_name, dtype=object))
+            color_blocks.append(colors[keep])
+    
+        if not sum(len(block) for block in feature_blocks):
             QMessageBox.warning(self, "Insufficient Data", "Not enough valid participant data for MDS.")
             return
     
-        all_participant_data = np.array(all_participant_data)
-        scaler = MinMaxScaler()
-        features_norm = scaler.fit_transform(all_participant_data)
-        mds_model = MDS(n_components=2, random_state=42)
-        embedding = mds_model.fit_transform(features_norm)
-    
-        if self.mds_color_feature.currentText() == "Dataset":
-            colors_for_points = [self.datasets[ds]["color"] if ds in self.datasets else 'black'
-                                 for ds in all_dataset_names]
-            scatter = ax.scatter(embedding[:, 0], embedding[:, 1], c=colors_for_points, s=50)
-            unique_datasets = list(dict.fromkeys(all_dataset_names))
-            handles = []
-            for ds in unique_datasets:
-                col = self.datasets[ds]["color"] if ds in self.datasets else 'black'
-                handles.append(plt.Line2D([0], [0], marker='o', color='w',
-                                           markerfacecolor=col, markersize=8, label=ds))
-            ax.legend(handles=handles, title="Dataset")
+        features_norm = _minmax_inplace(np.concatenate(feature_blocks))
+        all_dataset_names = np.concatenate(name_blocks)
+        all_feature_values = np.concatenate(color_blocks)
+        embedding = classical_mds(pairwise_distances(features_norm))
+        # Small cohorts stay editable vector markers; large ones become one embedded image
+        rasterized = len(embedding) > VECTOR_POINT_LIMIT
+    
+        scatter = self._mds_scatter
+        if (color_label != "Dataset" and scatter is not None and self.current_figure_type == 'mds'
+                and scatter.axes in self.figure.axes and scatter.colorbar is not None
+                and scatter.colorbar.ax.get_ylabel() == color_label and scatter.get_rasterized() == rasterized):
+            # Same kind of MDS plot as on screen: move and recolour its points, keeping the axes,
+            # labels and colorbar
+            scatter.set_offsets(embedding)
+            scatter.set_array(all_feature_values)
+            scatter.autoscale()
+            ax = scatter.axes
+            # relim() skips collections, so reset the data limits from the new points directly
+            ax.ignore_existing_data_limits = True
+            ax.update_datalim(embedding)
+            ax.autoscale_view()
+            self.canvas.draw()
+            return
+    
+        ax = self._reset_single_axes()
+        self.current_figure_type = 'mds'
+        self._mds_scatter = None
+        if color_label == "Dataset":
+            # One marker line per dataset: each has a single colour, so plot() can stamp its
+            # markers instead of scatter() evaluating a colour per point
+            for ds in dict.fromkeys(all_dataset_names):
+                sel = all_dataset_names == ds
+                ax.plot(embedding[sel, 0], embedding[sel, 1], ls='none', marker='o', markersize=np.sqrt(50),
+                        color=self.datasets[ds]["color"] if ds in self.datasets else 'black',
+                        label=ds, rasterized=rasterized)
+            ax.legend(title="Dataset")
         else:
             scatter = ax.scatter(embedding[:, 0], embedding[:, 1],
-                                 c=all_feature_values, cmap='viridis', s=50)
-            self.figure.colorbar(scatter, ax=ax, label=self.mds_color_feature.currentText())
+                                 c=all_feature_values, cmap='viridis', s=50, rasterized=rasterized)
+            self.figure.colorbar(scatter, ax=ax, label=color_label)
+            self._mds_scatter = scatter
     
         ax.set_title("MDS Plot")
         ax.set_xlabel("Dimension 1")
@@ -1437,104 +1725,68 @@ class ReactionTimeAnalysisGUI(QMainWindow):
     
         self.current_figure_type = "rdms"   # Set figure type so that saving uses "rdms"
         if self.combine_rdm_checkbox.isChecked():
-            combined_data = pd.DataFrame()
-            dataset_sources = {}  # Track which original dataset each participant belongs to
-            
+            frames = []
             for item in selected_items:
                 dataset_name = item.text()
                 data = self.get_filtered_data(dataset_name)
                 if data is not None:
-                    # Track the source dataset for each participant
-                    for participant in data['participant_number'].unique():
-                        dataset_sources[participant] = dataset_name
-                    
                     # Add source_dataset column if it doesn't already exist
                     if 'source_dataset' not in data.columns:
-                        data = data.copy()
-                        data['source_dataset'] = dataset_name
-                    
-                    combined_data = pd.concat([combined_data, data], ignore_index=True)
+                        data = data.assign(source_dataset=dataset_name)
+                    frames.append(data)
+            if not frames:
+                QMessageBox.warning(self, "Insufficient Data", "Not enough valid numeric values to compute combined RDM.")
+                return
+            combined_data = pd.concat(frames, ignore_index=True)
     
-            valid_data = []
-            all_participants = combined_data['participant_number'].unique()
             color_feature = self.mds_color_feature.currentText()
             
-            for participant in all_participants:
-                part_data = combined_data[combined_data['participant_number'] == participant]
-                feats = []
-                for feat in rdm_features:
-                    value = self.get_factor_value(part_data, feat, (0, 100))
-                    try:
-                        f_val = float(value)
-                    except (ValueError, TypeError):
-                        f_val = np.nan
-                    feats.append(f_val)
-                if len(feats) == 1:
-                    feats = feats * 2
-                
-                # Handle color feature values based on type
-                if color_feature == "Dataset":
-                    # Get the source dataset directly
-                    if 'source_dataset' in part_data.columns:
-                        color_val = part_data['source_dataset'].iloc[0]  # Use the source_dataset column
-                    else:
-                        color_val = dataset_sources.get(participant, "Unknown")  # Use our tracking dict as backup
-                else:
-                    # For age or custom columns
-                    color_val = self.get_factor_value(part_data, color_feature, (0, 100))
-                    
-                    # Only check for age filtering if age is selected and visible
-                    if color_feature == "Age" and self.mds_age_slider.isVisible():
-                        try:
-                            age_val = float(color_val)
-                            lo_age = self.mds_age_slider.first_position
-                            hi_age = self.mds_age_slider.second_position
-                            if not (lo_age <= age_val <= hi_age):
-                                continue
-                        except (ValueError, TypeError):
-                            # Skip if age value isn't valid and we need age filtering
-                            continue
-                
-                if any(np.isnan(feats)):
-                    continue
-                    
-                # Store participant ID, features, and color value
-                valid_data.append((participant, feats, color_val))
-    
-            if len(valid_data) < 2:
+            table = self.participant_feature_table(
+                combined_data, rdm_features + ([] if color_feature == "Dataset" else [color_feature]), (0, 100))
+            feature_matrix = self._feature_matrix(table, rdm_features)
+            keep = np.isfinite(feature_matrix).all(axis=1)
+            if color_feature == "Dataset":
+                # Each participant's source dataset, from its first row; drop_duplicates keeps the
+                # order of first appearance, as the table index does
+                color_values = combined_data.drop_duplicates('participant_number')['source_dataset'].to_numpy()
+            else:
+                # For age or custom columns
+                color_values = table[color_feature].to_numpy()
+                # Only filter by age if age is selected and the slider is visible; invalid ages are skipped
+                if color_feature == "Age" and self.mds_age_slider.isVisible():
+                    ages = table[color_feature].map(_as_float).to_numpy(dtype=np.float64)
+                    keep &= (ages >= self.mds_age_slider.first_position) & (ages <= self.mds_age_slider.second_position)
+    
+            if np.count_nonzero(keep) < 2:
                 QMessageBox.warning(self, "Insufficient Data", "Not enough valid numeric values to compute combined RDM.")
                 return
+            valid_ids = table.index[keep]
+            feature_values = feature_matrix[keep]
+            color_values = color_values[keep]
     
             # For "Dataset" feature, sort by dataset name
             if color_feature == "Dataset":
-                valid_data = sorted(valid_data, key=lambda x: str(x[2]))
-            # Sort by the color value if it's numeric, otherwise just use as-is
-            elif color_feature == "Age" or all(isinstance(item[2], (int, float)) for item in valid_data if item[2] is not None):
-                # Try to sort numerically when values are numbers (like age)
-                try:
-                    valid_data = sorted(valid_data, key=lambda x: float(x[2]) if x[2] is not None else float('inf'))
-                except (ValueError, TypeError):
-                    # If sorting fails, leave as-is
-                    pass
-            
-            valid_ids = [t[0] for t in valid_data]
-            feature_values = [t[1] for t in valid_data]
-            color_values = [t[2] for t in valid_data]
+                order = np.argsort(color_values.astype(str), kind='stable')
+            # Sort by the color value if it's numeric (like age), with missing values last,
+            # otherwise just use as-is
+            elif color_feature == "Age" or pd.api.types.infer_dtype(color_values, skipna=True) in (
+                    'floating', 'integer', 'mixed-integer-float'):
+                order = np.argsort(color_values.astype(np.float64), kind='stable')
+            else:
+                order = slice(None)
+            valid_ids = valid_ids[order].tolist()
+            feature_values = feature_values[order]
+            color_values = color_values[order].tolist()
     
-            combined_feature_array = np.array(feature_values)
-            scaler = MinMaxScaler()
-            combined_feature_array_norm = scaler.fit_transform(combined_feature_array)
-            from scipy.spatial.distance import pdist, squareform
-            feature_rdm = squareform(pdist(combined_feature_array_norm, metric=selected_metric))
+            combined_feature_array_norm = _minmax_inplace(feature_values)
+            from scipy.spatial.distance import squareform
+            feature_dists = pairwise_distances(combined_feature_array_norm, metric=selected_metric)
     
             # Create target RDM based on color feature values
             if color_feature == "Dataset":
                 # Map dataset names to integers for RDM calculation
                 unique_datasets = sorted(list(set(color_values)))
                 dataset_map = {ds: i for i, ds in enumerate(unique_datasets)}
-                numeric_values = np.array([dataset_map[val] for val in color_values]).reshape(-1, 1)
-                target_rdm = squareform(pdist(numeric_values, metric="euclidean"))
-                # For correlation calculation
                 numeric_color_values = [dataset_map[val] for val in color_values]
             else:
                 # For other features, try to create numeric values
@@ -1552,22 +1804,16 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     value_map = {val: i for i, val in enumerate(unique_values)}
                     numeric_color_values = [value_map[str(val)] for val in color_values]
                 
-                numeric_array = np.array(numeric_color_values).reshape(-1, 1)
-                target_rdm = squareform(pdist(numeric_array, metric="euclidean"))
+            # The target values are 1-D, so their condensed distances are just |v_i - v_j|
+            # over the upper triangle, in pdist order
+            target_values = np.asarray(numeric_color_values, dtype=np.float64)
+            rows, cols = np.triu_indices(len(target_values), k=1)
+            target_dists = np.abs(target_values[rows] - target_values[cols])
                 
-                # If we have non-numeric values, create a mapping
-                if any(np.isnan(numeric_color_values)):
-                    unique_values = sorted(list(set(str(val) for val in color_values)))
-                    value_map = {val: i for i, val in enumerate(unique_values)}
-                    numeric_color_values = [value_map[str(val)] for val in color_values]
-                
-                numeric_array = np.array(numeric_color_values).reshape(-1, 1)
-                target_rdm = squareform(pdist(numeric_array, metric="euclidean"))
-                
-            # Calculate correlation between feature RDM and target RDM
-            iu = np.triu_indices_from(feature_rdm, k=1)
-            feature_flat = feature_rdm[iu]
-            target_flat = target_rdm[iu]
+            # Calculate correlation between feature RDM and target RDM on the
+            # condensed upper triangles; the square matrices are only for display
+            feature_flat = feature_dists
+            target_flat = target_dists
             from scipy.stats import spearmanr
             valid_indices = ~np.isnan(target_flat) & ~np.isnan(feature_flat)
             if np.any(valid_indices):
@@ -1575,36 +1821,41 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             else:
                 corr, p_value = np.nan, np.nan
     
-            self.figure.clear()
-            ax1 = self.figure.add_subplot(121)
-            im1 = ax1.imshow(feature_rdm, cmap='viridis', interpolation='nearest')
-            ax1.set_title("Feature RDM", fontsize=10)
-            ax1.set_xlabel("Participant")
-            ax1.set_ylabel("Participant")
-            if len(valid_ids) <= 10:
-                ax1.set_xticks(range(len(valid_ids)))
-                ax1.set_xticklabels(valid_ids, rotation=45, fontsize=8)
-                ax1.set_yticks(range(len(valid_ids)))
-                ax1.set_yticklabels(valid_ids, fontsize=8)
+            feature_rdm = squareform(feature_dists)
+            target_rdm = squareform(target_dists)
+            images = self._rdm_images
+            if images is not None and len(self.figure.axes) == 4 and all(
+                    im.axes in self.figure.axes and im.colorbar is not None for im in images):
+                # The combined RDM figure is still on screen: swap the matrices into its images;
+                # the colorbars follow their images' autoscaled limits
+                for im, rdm in zip(images, (feature_rdm, target_rdm)):
+                    im.set_data(rdm)
+                    im.set_extent((-0.5, len(rdm) - 0.5, len(rdm) - 0.5, -0.5))
+                    im.autoscale()
+                for text in list(self.figure.texts):
+                    text.remove()
             else:
-                ax1.set_xticks([])
-                ax1.set_yticks([])
-            self.figure.colorbar(im1, ax=ax1, fraction=0.046, pad=0.04)
-    
-            ax2 = self.figure.add_subplot(122)
-            im2 = ax2.imshow(target_rdm, cmap='viridis', interpolation='nearest')
-            ax2.set_title(f"{color_feature} RDM", fontsize=10)
-            ax2.set_xlabel("Participant")
-            ax2.set_ylabel("Participant")
-            if len(valid_ids) <= 10:
-                ax2.set_xticks(range(len(valid_ids)))
-                ax2.set_xticklabels(valid_ids, rotation=45, fontsize=8)
-                ax2.set_yticks(range(len(valid_ids)))
-                ax2.set_yticklabels(valid_ids, fontsize=8)
-            else:
-                ax2.set_xticks([])
-                ax2.set_yticks([])
-            self.figure.colorbar(im2, ax=ax2, fraction=0.046, pad=0.04)
+                self.figure.clear()
+                images = []
+                for position, rdm in ((121, feature_rdm), (122, target_rdm)):
+                    ax = self.figure.add_subplot(position)
+                    images.append(ax.imshow(rdm, cmap='viridis', interpolation='nearest', rasterized=True))
+                    self.figure.colorbar(images[-1], ax=ax, fraction=0.046, pad=0.04)
+                self._rdm_images = images = tuple(images)
+    
+            for im, title in zip(images, ("Feature RDM", f"{color_feature} RDM")):
+                ax = im.axes
+                ax.set_title(title, fontsize=10)
+                ax.set_xlabel("Participant")
+                ax.set_ylabel("Participant")
+                if len(valid_ids) <= 10:
+                    ax.set_xticks(range(len(valid_ids)))
+                    ax.set_xticklabels(valid_ids, rotation=45, fontsize=8)
+                    ax.set_yticks(range(len(valid_ids)))
+                    ax.set_yticklabels(valid_ids, fontsize=8)
+                else:
+                    ax.set_xticks([])
+                    ax.set_yticks([])
             if not (np.isnan(corr) or np.isnan(p_value)):
                 correlation_text = f"Spearman correlation: r = {corr:.3f}, p = {p_value:.3f}"
                 # Place text at the bottom of the figure
@@ -1656,7 +1907,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
     
             explanation = f"RDMs computed for features\nDistance Metric: {metric_label}\n\n"
     
-            from scipy.spatial.distance import pdist, squareform
+            from scipy.spatial.distance import squareform
     
             for idx, item in enumerate(selected_items):
                 dataset_name = item.text()
@@ -1664,45 +1915,26 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                 if data is None:
                     continue
     
-                participants = sorted(data['participant_number'].unique())
-                feature_values = []
-                valid_ids = []
-                for participant in participants:
-                    part_data = data[data['participant_number'] == participant]
-                    feats = []
-                    for feat in rdm_features:
-                        value = self.get_factor_value(part_data, feat, (0, 100))
-                        try:
-                            f_val = float(value)
-                        except (ValueError, TypeError):
-                            f_val = np.nan
-                        feats.append(f_val)
-                    if len(feats) == 1:
-                        feats = feats * 2
-                    age = self.get_factor_value(part_data, "Age", (0, 100))
-                    try:
-                        age_val = float(age)
-                    except (ValueError, TypeError):
-                        age_val = np.nan
-                    if np.isnan(age_val) or any(np.isnan(feats)):
-                        continue
-                    if self.mds_age_slider.isVisible():
-                        lo_age = self.mds_age_slider.first_position
-                        hi_age = self.mds_age_slider.second_position
-                        if not (lo_age <= age_val <= hi_age):
-                            continue
-                    feature_values.append(feats)
-                    valid_ids.append(participant)
-    
-                if len(feature_values) < 2:
+                table = self.participant_feature_table(data, rdm_features + ["Age"], (0, 100)).sort_index()
+                feature_matrix = self._feature_matrix(table, rdm_features)
+                ages = table["Age"].map(_as_float).to_numpy(dtype=np.float64)
+                # Participants need numeric features and an age, within the slider range when it is shown
+                valid = np.isfinite(feature_matrix).all(axis=1) & ~np.isnan(ages)
+                if self.mds_age_slider.isVisible():
+                    lo_age = self.mds_age_slider.first_position
+                    hi_age = self.mds_age_slider.second_position
+                    valid &= (ages >= lo_age) & (ages <= hi_age)
+                feature_array = feature_matrix[valid]
+                valid_ids = table.index[valid].tolist()
+    
+                if len(feature_array) < 2:
                     explanation += f"{dataset_name}: Not enough numeric values.\n\n"
                     continue
     
-                feature_array = np.array(feature_values)
-                rdm = squareform(pdist(feature_array, metric=selected_metric))
+                rdm = squareform(pairwise_distances(feature_array, metric=selected_metric))
     
                 ax = axs[idx]
-                im = ax.imshow(rdm, cmap='viridis', interpolation='nearest')
+                im = ax.imshow(rdm, cmap='viridis', interpolation='nearest', rasterized=True)
                 ax.set_title(f"{dataset_name}\n(RDM)", fontsize=10)
                 ax.set_xlabel("Participant")
                 ax.set_ylabel("Participant")
@@ -1769,8 +2001,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         if not selected_items:
             return
     
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        ax = self._reset_single_axes()
         self.current_figure_type = 'mean_rts'
     
         # Set up width and positions
@@ -1780,60 +2011,54 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         bar_width = total_width / n_datasets
         group_positions = np.arange(n_conditions)
         
+        # Filter and summarise each dataset once for all the passes below
+        filtered = {item.text(): self.get_filtered_data(item.text()) for item in selected_items}
+        summaries = {name: self.rt_summary(name, data, 'mean') for name, data in filtered.items() if data is not None}
+        rt_by_mod = {(name, mod): data.loc[data['modality'] == mod, 'reaction_time'].to_numpy()
+                     for name, data in filtered.items() if data is not None for mod in (1, 2, 3)}
+    
         # Calculate global max height first
         global_max_height = 0
-        for item in selected_items:
-            data = self.get_filtered_data(item.text())
-            if data is not None:
-                mean_rt, std_error = self.calculate_mean_rt(data)
-                global_max_height = max(global_max_height, np.max(mean_rt + std_error))
+        for mean_rt, std_error in summaries.values():
+            global_max_height = max(global_max_height, np.max(mean_rt + std_error))
     
         # Plot datasets and calculate statistics
         stats_text = "Within Dataset Comparisons:\n"
         for i, item in enumerate(selected_items):
             name = item.text()
-            data = self.get_filtered_data(name)
+            data = filtered[name]
             if data is None:
                 continue
                 
-            mean_rt, std_error = self.calculate_mean_rt(data)
+            mean_rt, std_error = summaries[name]
             x = group_positions + (i - (n_datasets-1)/2) * bar_width
             
-            # Plot bars with different patterns
-            for j, modality in enumerate(['Audio', 'Visual', 'Audiovisual']):
-                base_color = self.modality_colors[modality]
-                pattern = self.datasets[name]["pattern"]
-                alpha = self.datasets[name]["alpha"]
-                
-                # Create bar with correct color and alpha
-                bar = ax.bar(x[j], mean_rt.iloc[j], bar_width,  # Changed value to mean_rt.iloc[j]
-                            yerr=std_error.iloc[j], 
-                            label=f"{modality} ({name})",
-                            color='none' if pattern == 'clear' else ('white' if pattern != 'solid' else base_color),
-                            edgecolor=base_color,
-                            alpha=alpha,
-                            capsize=4)
-            
-                # Apply pattern after bar creation
-                if pattern == 'hatched':
-                    bar[0].set_hatch('///')
-                elif pattern == 'dotted':
-                    bar[0].set_hatch('...')
-                elif pattern == 'dashed':
-                    bar[0].set_hatch('--')
-                elif pattern == 'cross-hatched':
-                    bar[0].set_hatch('xxx')
+            # Plot the dataset's three bars in one call, pattern and alpha shared
+            modalities = ['Audio', 'Visual', 'Audiovisual']
+            base_colors = [self.modality_colors[modality] for modality in modalities]
+            pattern = self.datasets[name]["pattern"]
+            bars = ax.bar(x, mean_rt.to_numpy(), bar_width,
+                          yerr=std_error.to_numpy(),
+                          color=_pattern_facecolor(pattern, base_colors),
+                          edgecolor=base_colors,
+                          alpha=self.datasets[name]["alpha"],
+                          hatch=PATTERN_HATCHES.get(pattern),
+                          capsize=4)
+            # One legend entry per bar
+            for patch, modality in zip(bars, modalities):
+                patch.set_label(f"{modality} ({name})")
     
             # Within-dataset comparisons
             if data is not None:
                 stats_text += f"{name}: "
                 comparisons = [(0,1), (1,2), (0,2)]
                 pair_names = ["A v V", "V v AV", "A v AV"]
+                modality_rts = [rt_by_mod[name, mod] for mod in (1, 2, 3)]
+                t_stats, p_vals = ttest_pairs(modality_rts, comparisons)
+                bf10s = bayes_factor_pairs(modality_rts, comparisons, t_stats)
                 
                 for idx, (mod_pair, pair_name) in enumerate(zip(comparisons, pair_names)):
                     mod1, mod2 = mod_pair
-                    rt1 = data[data['modality'] == mod1+1]['reaction_time']
-                    rt2 = data[data['modality'] == mod2+1]['reaction_time']
                     
                     # Updated height calculations for better staggering
                     base_height = global_max_height * 1.05  # Starting height
@@ -1842,24 +2067,25 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     bracket_height = base_height + dataset_offset + (idx * comparison_spacing)
                     
                     if self.ttest_radio.isChecked():
-                        t_stat, p_val = ttest_ind(rt1, rt2)
+                        p_val = p_vals[idx]
                         stats_text += f"{pair_name} p={p_val:.2e}, "
                         if self.within_stats_checkbox.isChecked():
                             self.draw_significance_brackets(ax, x[mod1], x[mod2], 
                                                          bracket_height, 
                                                          p_value=p_val,
                                                          bracket_level=idx,
-                                                         is_between_datasets=False)
+                                                         is_between_datasets=False,
+                                                         bar_width=bar_width)
                     else:
-                        t_stat, _ = ttest_ind(rt1, rt2)
-                        bf10 = bayesfactor_ttest(t=t_stat, nx=len(rt1), ny=len(rt2))
+                        bf10 = bf10s[idx]
                         stats_text += f"{pair_name} BF₁₀={bf10:.2e}, "
                         if self.within_stats_checkbox.isChecked():
                             self.draw_significance_brackets(ax, x[mod1], x[mod2], 
                                                          bracket_height,
                                                          bf10=bf10,
                                                          bracket_level=idx,
-                                                         is_between_datasets=False)
+                                                         is_between_datasets=False,
+                                                         bar_width=bar_width)
                 stats_text = stats_text.rstrip(", ") + "\n"
     
         # Between-dataset comparisons
@@ -1867,40 +2093,39 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             stats_text += "\nBetween Datasets:\n"
             for modality, mod_name in enumerate(['Audio', 'Visual', 'Audiovisual'], 1):
                 stats_text += f"{mod_name}: "
-                between_comparisons = []
+                dataset_rts = []
+                for item in selected_items:
+                    dataset_rts.append(rt_by_mod.get((item.text(), modality), []))
+                between_comparisons = [(i, j) for i in range(n_datasets - 1) for j in range(i + 1, n_datasets)
+                                       if len(dataset_rts[i]) > 0 and len(dataset_rts[j]) > 0]
+                t_stats, p_vals = ttest_pairs(dataset_rts, between_comparisons)
+                bf10s = bayes_factor_pairs(dataset_rts, between_comparisons, t_stats)
                 
-                for i, item1 in enumerate(selected_items[:-1]):
-                    for j, item2 in enumerate(selected_items[i+1:], i+1):
-                        data1 = self.get_filtered_data(item1.text())
-                        data2 = self.get_filtered_data(item2.text())
-                        if data1 is not None and data2 is not None:
-                            rt1 = data1[data1['modality'] == modality]['reaction_time']
-                            rt2 = data2[data2['modality'] == modality]['reaction_time']
-                            if len(rt1) > 0 and len(rt2) > 0:
-                                x1 = group_positions[modality-1] + (i - (n_datasets-1)/2) * bar_width
-                                x2 = group_positions[modality-1] + (j - (n_datasets-1)/2) * bar_width
-                                
-                                bracket_height = global_max_height * (1.40 + 0.06 * (j-i))
-                                
-                                if self.ttest_radio.isChecked():
-                                    t_stat, p_val = ttest_ind(rt1, rt2)
-                                    stats_text += f"{item1.text()} v {item2.text()} p={p_val:.2e}, "
-                                    if self.between_stats_checkbox.isChecked():
-                                        self.draw_significance_brackets(ax, x1, x2,
-                                                                     bracket_height,
-                                                                     p_value=p_val,
-                                                                     bracket_level=j-i,
-                                                                     is_between_datasets=True)
-                                else:
-                                    t_stat, _ = ttest_ind(rt1, rt2)
-                                    bf10 = bayesfactor_ttest(t=t_stat, nx=len(rt1), ny=len(rt2))
-                                    stats_text += f"{item1.text()} v {item2.text()} BF₁₀={bf10:.2e}, "
-                                    if self.between_stats_checkbox.isChecked():
-                                        self.draw_significance_brackets(ax, x1, x2,
-                                                                     bracket_height,
-                                                                     bf10=bf10,
-                                                                     bracket_level=j-i,
-                                                                     is_between_datasets=True)
+                for (i, j), p_val, bf10 in zip(between_comparisons, p_vals, bf10s):
+                    item1, item2 = selected_items[i], selected_items[j]
+                    x1 = group_positions[modality-1] + (i - (n_datasets-1)/2) * bar_width
+                    x2 = group_positions[modality-1] + (j - (n_datasets-1)/2) * bar_width
+                    
+                    bracket_height = global_max_height * (1.40 + 0.06 * (j-i))
+                    
+                    if self.ttest_radio.isChecked():
+                        stats_text += f"{item1.text()} v {item2.text()} p={p_val:.2e}, "
+                        if self.between_stats_checkbox.isChecked():
+                            self.draw_significance_brackets(ax, x1, x2,
+                                                         bracket_height,
+                                                         p_value=p_val,
+                                                         bracket_level=j-i,
+                                                         is_between_datasets=True,
+                                                         bar_width=bar_width)
+                    else:
+                        stats_text += f"{item1.text()} v {item2.text()} BF₁₀={bf10:.2e}, "
+                        if self.between_stats_checkbox.isChecked():
+                            self.draw_significance_brackets(ax, x1, x2,
+                                                         bracket_height,
+                                                         bf10=bf10,
+                                                         bracket_level=j-i,
+                                                         is_between_datasets=True,
+                                                         bar_width=bar_width)
                 stats_text = stats_text.rstrip(", ") + "\n"
     
         # Plot customization
@@ -1917,15 +2142,11 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         figure_data = {
             'datasets': {}
         }
-        for item in selected_items:
-            name = item.text()
-            data = self.get_filtered_data(name)
-            if data is not None:
-                mean_rt, std_error = self.calculate_mean_rt(data)
-                figure_data['datasets'][name] = {
-                    'mean_rt': mean_rt.tolist(),
-                    'std_error': std_error.tolist()
-                }
+        for name, (mean_rt, std_error) in summaries.items():
+            figure_data['datasets'][name] = {
+                'mean_rt': mean_rt.tolist(),
+                'std_error': std_error.tolist()
+            }
         self.store_figure_data('mean_rts', figure_data)
         # Increase y-axis limit to accommodate all brackets
         self._set_y_limits(ax, 0, global_max_height * 1.5)
@@ -1942,8 +2163,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         if not selected_items:
             return
     
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        ax = self._reset_single_axes()
         self.current_figure_type = 'median_rts'
     
         # Set up width and positions
@@ -1953,60 +2173,57 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         bar_width = total_width / n_datasets
         group_positions = np.arange(n_conditions)
         
+        # Filter and summarise each dataset once for all the passes below
+        filtered = {item.text(): self.get_filtered_data(item.text()) for item in selected_items}
+        summaries = {name: self.rt_summary(name, data, 'median') for name, data in filtered.items()
+                     if data is not None}
+        rt_by_mod = {(name, mod): data.loc[data['modality'] == mod, 'reaction_time'].to_numpy()
+                     for name, data in filtered.items() if data is not None for mod in (1, 2, 3)}
+    
         # Calculate global max height first
         global_max_height = 0
-        for item in selected_items:
-            data = self.get_filtered_data(item.text())
-            if data is not None:
-                median_rt, std_error = self.calculate_median_rt(data)
-                global_max_height = max(global_max_height, np.max(median_rt + std_error))
+        for median_rt, std_error in summaries.values():
+            global_max_height = max(global_max_height, np.max(median_rt + std_error))
     
         # Plot datasets and calculate statistics
         stats_text = "Within Dataset Comparisons:\n"
         for i, item in enumerate(selected_items):
             name = item.text()
-            data = self.get_filtered_data(name)
+            data = filtered[name]
             if data is None:
                 continue
                 
-            median_rt, std_error = self.calculate_median_rt(data)
+            median_rt, std_error = summaries[name]
             x = group_positions + (i - (n_datasets-1)/2) * bar_width
+            pattern = self.datasets[name]["pattern"]
+            alpha = self.datasets[name]["alpha"]
+            hatch = PATTERN_HATCHES.get(pattern)
             
             # Plot bars with different patterns
             for j, modality in enumerate(['Audio', 'Visual', 'Audiovisual']):
                 base_color = self.modality_colors[modality]
-                pattern = self.datasets[name]["pattern"]
-                alpha = self.datasets[name]["alpha"]
                 
                 # Create bar with correct color and alpha
-                bar = ax.bar(x[j], median_rt.iloc[j], bar_width,
-                            yerr=std_error.iloc[j], 
-                            label=f"{modality} ({name})",
-                            color='none' if pattern == 'clear' else ('white' if pattern != 'solid' else base_color),
-                            edgecolor=base_color,
-                            alpha=alpha,
-                            capsize=4)
-
-                # Apply pattern after bar creation
-                if pattern == 'hatched':
-                    bar[0].set_hatch('///')
-                elif pattern == 'dotted':
-                    bar[0].set_hatch('...')
-                elif pattern == 'dashed':
-                    bar[0].set_hatch('--')
-                elif pattern == 'cross-hatched':
-                    bar[0].set_hatch('xxx')
+                ax.bar(x[j], median_rt.iloc[j], bar_width,
+                       yerr=std_error.iloc[j], 
+                       label=f"{modality} ({name})",
+                       color=_pattern_facecolor(pattern, base_color),
+                       edgecolor=base_color,
+                       alpha=alpha,
+                       hatch=hatch,
+                       capsize=4)
     
             # Within-dataset comparisons
             if data is not None:
                 stats_text += f"{name}: "
                 comparisons = [(0,1), (1,2), (0,2)]
                 pair_names = ["A v V", "V v AV", "A v AV"]
+                modality_rts = [rt_by_mod[name, mod] for mod in (1, 2, 3)]
+                t_stats, p_vals = ttest_pairs(modality_rts, comparisons)
+                bf10s = bayes_factor_pairs(modality_rts, comparisons, t_stats)
                 
                 for idx, (mod_pair, pair_name) in enumerate(zip(comparisons, pair_names)):
                     mod1, mod2 = mod_pair
-                    rt1 = data[data['modality'] == mod1+1]['reaction_time']
-                    rt2 = data[data['modality'] == mod2+1]['reaction_time']
                     
                     # Updated height calculations for better staggering
                     base_height = global_max_height * 1.05  # Starting height
@@ -2015,17 +2232,17 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     bracket_height = base_height + dataset_offset + (idx * comparison_spacing)
                     
                     if self.ttest_radio.isChecked():
-                        t_stat, p_val = ttest_ind(rt1, rt2)
+                        p_val = p_vals[idx]
                         stats_text += f"{pair_name} p={p_val:.2e}, "
                         if self.within_stats_checkbox.isChecked():
                             self.draw_significance_brackets(ax, x[mod1], x[mod2], 
                                                          bracket_height, 
                                                          p_value=p_val,
                                                          bracket_level=idx,
-                                                         is_between_datasets=False)
+                                                         is_between_datasets=False,
+                                                         bar_width=bar_width)
                     else:
-                        t_stat, _ = ttest_ind(rt1, rt2)
-                        bf10 = bayesfactor_ttest(t=t_stat, nx=len(rt1), ny=len(rt2))
+                        bf10 = bf10s[idx]
                         if abs(bf10) > 1000:
                             stats_text += f"{pair_name} BF₁₀={bf10:.2e}, "
                         else:
@@ -2035,7 +2252,8 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                                                          bracket_height,
                                                          bf10=bf10,
                                                          bracket_level=idx,
-                                                         is_between_datasets=False)
+                                                         is_between_datasets=False,
+                                                         bar_width=bar_width)
                 stats_text = stats_text.rstrip(", ") + "\n"
     
         # Between-dataset comparisons
@@ -2043,43 +2261,42 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             stats_text += "\nBetween Datasets:\n"
             for modality, mod_name in enumerate(['Audio', 'Visual', 'Audiovisual'], 1):
                 stats_text += f"{mod_name}: "
-                between_comparisons = []
+                dataset_rts = []
+                for item in selected_items:
+                    dataset_rts.append(rt_by_mod.get((item.text(), modality), []))
+                between_comparisons = [(i, j) for i in range(n_datasets - 1) for j in range(i + 1, n_datasets)
+                                       if len(dataset_rts[i]) > 0 and len(dataset_rts[j]) > 0]
+                t_stats, p_vals = ttest_pairs(dataset_rts, between_comparisons)
+                bf10s = bayes_factor_pairs(dataset_rts, between_comparisons, t_stats)
                 
-                for i, item1 in enumerate(selected_items[:-1]):
-                    for j, item2 in enumerate(selected_items[i+1:], i+1):
-                        data1 = self.get_filtered_data(item1.text())
-                        data2 = self.get_filtered_data(item2.text())
-                        if data1 is not None and data2 is not None:
-                            rt1 = data1[data1['modality'] == modality]['reaction_time']
-                            rt2 = data2[data2['modality'] == modality]['reaction_time']
-                            if len(rt1) > 0 and len(rt2) > 0:
-                                x1 = group_positions[modality-1] + (i - (n_datasets-1)/2) * bar_width
-                                x2 = group_positions[modality-1] + (j - (n_datasets-1)/2) * bar_width
-                                
-                                bracket_height = global_max_height * (1.40 + 0.06 * (j-i))
-                                
-                                if self.ttest_radio.isChecked():
-                                    t_stat, p_val = ttest_ind(rt1, rt2)
-                                    stats_text += f"{item1.text()} v {item2.text()} p={p_val:.2e}, "
-                                    if self.between_stats_checkbox.isChecked():
-                                        self.draw_significance_brackets(ax, x1, x2,
-                                                                     bracket_height,
-                                                                     p_value=p_val,
-                                                                     bracket_level=j-i,
-                                                                     is_between_datasets=True)
-                                else:
-                                    t_stat, _ = ttest_ind(rt1, rt2)
-                                    bf10 = bayesfactor_ttest(t=t_stat, nx=len(rt1), ny=len(rt2))
-                                    if abs(bf10) > 1000:
-                                        stats_text += f"{item1.text()} v {item2.text()} BF₁₀={bf10:.2e}, "
-                                    else:
-                                        stats_text += f"{item1.text()} v {item2.text()} BF₁₀={bf10:.2f}, "
-                                    if self.between_stats_checkbox.isChecked():
-                                        self.draw_significance_brackets(ax, x1, x2,
-                                                                     bracket_height,
-                                                                     bf10=bf10,
-                                                                     bracket_level=j-i,
-                                                                     is_between_datasets=True)
+                for (i, j), p_val, bf10 in zip(between_comparisons, p_vals, bf10s):
+                    item1, item2 = selected_items[i], selected_items[j]
+                    x1 = group_positions[modality-1] + (i - (n_datasets-1)/2) * bar_width
+                    x2 = group_positions[modality-1] + (j - (n_datasets-1)/2) * bar_width
+                    
+                    bracket_height = global_max_height * (1.40 + 0.06 * (j-i))
+                    
+                    if self.ttest_radio.isChecked():
+                        stats_text += f"{item1.text()} v {item2.text()} p={p_val:.2e}, "
+                        if self.between_stats_checkbox.isChecked():
+                            self.draw_significance_brackets(ax, x1, x2,
+                                                         bracket_height,
+                                                         p_value=p_val,
+                                                         bracket_level=j-i,
+                                                         is_between_datasets=True,
+                                                         bar_width=bar_width)
+                    else:
+                        if abs(bf10) > 1000:
+                            stats_text += f"{item1.text()} v {item2.text()} BF₁₀={bf10:.2e}, "
+                        else:
+                            stats_text += f"{item1.text()} v {item2.text()} BF₁₀={bf10:.2f}, "
+                        if self.between_stats_checkbox.isChecked():
+                            self.draw_significance_brackets(ax, x1, x2,
+                                                         bracket_height,
+                                                         bf10=bf10,
+                                                         bracket_level=j-i,
+                                                         is_between_datasets=True,
+                                                         bar_width=bar_width)
                 stats_text = stats_text.rstrip(", ") + "\n"
     
         # Plot customization
@@ -2099,15 +2316,11 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         figure_data = {
             'datasets': {}
         }
-        for item in selected_items:
-            name = item.text()
-            data = self.get_filtered_data(name)
-            if data is not None:
-                median_rt, std_error = self.calculate_median_rt(data)
-                figure_data['datasets'][name] = {
-                    'median_rt': median_rt.tolist(),
-                    'std_error': std_error.tolist()
-                }
+        for name, (median_rt, std_error) in summaries.items():
+            figure_data['datasets'][name] = {
+                'median_rt': median_rt.tolist(),
+                'std_error': std_error.tolist()
+            }
         self.store_figure_data('median_rts', figure_data)
         self._customize_axes(ax)
         self.figure.tight_layout()
@@ -2123,8 +2336,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         if not selected_items:
             return
     
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        ax = self._reset_single_axes()
         self.current_figure_type = 'boxplot_rts'
     
         all_data = []
@@ -2134,6 +2346,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         alphas = []    # Add list for alphas
         max_rt = 0
         min_rt = float('inf')
+        rt_by_mod = {}  # {(dataset, modality): reaction times}, shared by the boxes and the figure data
         
         modality_colors = {
             'Audio': 'red',
@@ -2152,7 +2365,8 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             alpha = self.datasets[name].get("alpha", 0.7)  # Default alpha if not set
                 
             for modality, mod_name in enumerate(['Audio', 'Visual', 'Audiovisual'], 1):
-                mod_data = data[data['modality'] == modality]['reaction_time']
+                mod_data = data.loc[data['modality'] == modality, 'reaction_time'].to_numpy()
+                rt_by_mod[name, modality] = mod_data
                 all_data.append(mod_data)
                 labels.append(f"{mod_name}\n{name}")
                 colors.append(modality_colors[mod_name])
@@ -2169,25 +2383,14 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             
             # Color and style the boxes with patterns
             for i, (patch, color, pattern, alpha) in enumerate(zip(bp['boxes'], colors, patterns, alphas)):
-                if pattern == 'clear':
-                    patch.set_facecolor('none')
-                elif pattern == 'solid':
-                    patch.set_facecolor(color)
-                else:
-                    patch.set_facecolor('white')
-                
+                patch.set_facecolor(_pattern_facecolor(pattern, color))
                 patch.set_edgecolor(color)
                 patch.set_alpha(alpha)
                 
                 # Apply patterns
-                if pattern == 'hatched':
-                    patch.set_hatch('///')
-                elif pattern == 'dotted':
-                    patch.set_hatch('...')
-                elif pattern == 'dashed':
-                    patch.set_hatch('--')
-                elif pattern == 'cross-hatched':
-                    patch.set_hatch('xxx')
+                hatch = PATTERN_HATCHES.get(pattern)
+                if hatch:
+                    patch.set_hatch(hatch)
             
             # Style other boxplot elements
             plt.setp(bp['whiskers'], color='black')
@@ -2216,17 +2419,40 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             }
             for item in selected_items:
                 name = item.text()
-                data = self.get_filtered_data(name)
-                if data is not None:
+                if (name, 1) in rt_by_mod:
                     figure_data['datasets'][name] = {
-                        'Audio': data[data['modality'] == 1]['reaction_time'].tolist(),
-                        'Visual': data[data['modality'] == 2]['reaction_time'].tolist(),
-                        'Audiovisual': data[data['modality'] == 3]['reaction_time'].tolist()
+                        'Audio': rt_by_mod[name, 1].tolist(),
+                        'Visual': rt_by_mod[name, 2].tolist(),
+                        'Audiovisual': rt_by_mod[name, 3].tolist()
                     }
             self.store_figure_data('boxplot_rts', figure_data)
     
             self.canvas.draw()
 
+    def _anova_table(self, data, between):
+        """
+        Between-subjects ANOVA of reaction_time over one or two factors.
+
+        Returns a table with the same layout as pingouin.anova(detailed=True):
+        Source, SS, DF, MS, F, p-unc and np2, with a 'Within' (one-way) or
+        'Residual' (two-way) error row.
+        """
+        codes = [pd.factorize(data[factor])[0] for factor in between]
+        ss, df, f_vals, p_vals = fast_anova(data['reaction_time'].to_numpy(), *codes)
+        if len(between) == 1:
+            sources = [between[0], 'Within']
+        else:
+            sources = [between[0], between[1], f"{between[0]} * {between[1]}", 'Residual']
+        return pd.DataFrame({
+            'Source': sources,
+            'SS': ss,
+            'DF': df,
+            'MS': ss / df,
+            'F': f_vals,
+            'p-unc': p_vals,
+            'np2': np.append(ss[:-1] / (ss[:-1] + ss[-1]), np.nan),
+        })
+
     def perform_anova_analysis(self):
         selected_items = self.dataset_list.selectedItems()
         if not selected_items:
@@ -2252,15 +2478,11 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         # Perform ANOVA based on number of datasets
         if len(selected_items) == 1:
             # One-way ANOVA across modalities
-            anova_results = anova(dv='reaction_time', 
-                                between=['modality'],
-                                data=anova_data, detailed=True)
+            anova_results = self._anova_table(anova_data, ['modality'])
             needed_cols = ['Source', 'SS', 'DF', 'F', 'p-unc', 'np2']
         else:
             # Two-way ANOVA with dataset factor
-            anova_results = anova(dv='reaction_time', 
-                                between=['modality', 'dataset'],
-                                data=anova_data, detailed=True)
+            anova_results = self._anova_table(anova_data, ['modality', 'dataset'])
             needed_cols = ['Source', 'SS', 'DF', 'F', 'p-unc', 'np2']
         
         anova_results = anova_results[needed_cols]
@@ -2273,8 +2495,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             )
         
         # Clear and set up figure
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        ax = self._reset_single_axes()
         ax.axis('off')
         
         # Create table data with scientific notation
@@ -2443,35 +2664,35 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         modalities = ['Audio', 'Visual', 'Audiovisual']
         p_values = []
         test_results = []
-
-        for i in range(len(modalities)):
-            for j in range(i + 1, len(modalities)):
-                mod1 = data[data['modality'] == i + 1]['reaction_time']
-                mod2 = data[data['modality'] == j + 1]['reaction_time']
-
-                if self.ttest_radio.isChecked():
-                    t_stat, p_value = ttest_ind(mod1, mod2)
-                    # Calculate effect size (Cohen's d)
-                    pooled_std = np.sqrt(((len(mod1) - 1) * mod1.std() ** 2 + 
-                                        (len(mod2) - 1) * mod2.std() ** 2) / 
-                                        (len(mod1) + len(mod2) - 2))
-                    cohen_d = (mod1.mean() - mod2.mean()) / pooled_std
-                    test_results.append((t_stat, p_value, cohen_d))
-                    p_values.append(p_value)
-                else:  # Bayes Factor
-                    t_stat, p_value = ttest_ind(mod1, mod2)
-                    bf10 = bayesfactor_ttest(t=float(t_stat), nx=len(mod1), ny=len(mod2))
-                    bf10 = float(bf10)  # Convert bf10 to a float
-                    bf01 = 1 / bf10 if bf10 > 0 else float('inf')
-                    
-                    # Format BF10 to scientific notation if > 1000
-                    if (bf10 > 1000):
-                        bf10 = f"{bf10:.2e}"
-                    else:
-                        bf10 = f"{bf10:.2f}"
-                    
-                    test_results.append((bf10, bf01, None))
-                    p_values.append(bf01)
+        modality_rts = [data[data['modality'] == i + 1]['reaction_time'] for i in range(len(modalities))]
+        pairs = [(i, j) for i in range(len(modalities)) for j in range(i + 1, len(modalities))]
+        t_stats, p_vals = ttest_pairs(modality_rts, pairs)
+        bf10s = bayes_factor_pairs(modality_rts, pairs, t_stats)
+
+        for (i, j), t_stat, p_value, bf10 in zip(pairs, t_stats, p_vals, bf10s):
+            mod1 = modality_rts[i]
+            mod2 = modality_rts[j]
+
+            if self.ttest_radio.isChecked():
+                # Calculate effect size (Cohen's d)
+                pooled_std = np.sqrt(((len(mod1) - 1) * mod1.std() ** 2 + 
+                                    (len(mod2) - 1) * mod2.std() ** 2) / 
+                                    (len(mod1) + len(mod2) - 2))
+                cohen_d = (mod1.mean() - mod2.mean()) / pooled_std
+                test_results.append((t_stat, p_value, cohen_d))
+                p_values.append(p_value)
+            else:  # Bayes Factor
+                bf10 = float(bf10)  # Convert bf10 to a float
+                bf01 = 1 / bf10 if bf10 > 0 else float('inf')
+                
+                # Format BF10 to scientific notation if > 1000
+                if (bf10 > 1000):
+                    bf10 = f"{bf10:.2e}"
+                else:
+                    bf10 = f"{bf10:.2f}"
+                
+                test_results.append((bf10, bf01, None))
+                p_values.append(bf01)
 
         return p_values, test_results
 
@@ -2544,16 +2765,15 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             ax.tick_params(axis='both', which='major', pad=8)
             
             # Rest of the plotting code...
-            excluded_participants = self.excluded_participants.get(dataset_name, [])
+            excluded_participants = set(self.excluded_participants.get(dataset_name, []))
 
-            for participant in self.datasets[dataset_name]["data"]['participant_number'].unique():
+            for participant, rts in self.datasets[dataset_name]["soa"].items():
                 if participant in excluded_participants:
                     continue
 
-                participant_data = self.datasets[dataset_name]["data"][self.datasets[dataset_name]["data"]['participant_number'] == participant]
-                median_rt = participant_data.groupby('modality')['reaction_time'].median()
-
-                if len(median_rt) == 3:
+                if len(rts) == 3:
+                    # float32 is for storage only; the medians are taken in float64 like the exported ones
+                    median_rt = [np.nanmedian(rts[key].astype(np.float64)) for key in ('audio', 'visual', 'av')]
                     ax.plot(['Audio', 'Visual', 'Audiovisual'], median_rt, '-o',
                             label=f'P{participant}', markersize=2)
 
@@ -2580,18 +2800,22 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             dataset_name = item.text()
             data = self.get_filtered_data(dataset_name)
             if data is not None:
+                participants = {}
                 figure_data['datasets'][dataset_name] = {
-                    'participants': {}
+                    'participants': participants
                 }
-                for participant in data['participant_number'].unique():
-                    participant_data = data[data['participant_number'] == participant]
-                    median_rt = participant_data.groupby('modality')['reaction_time'].median()
-                    if len(median_rt) == 3:
-                        figure_data['datasets'][dataset_name]['participants'][str(participant)] = {
-                            'Audio': median_rt[1],
-                            'Visual': median_rt[2],
-                            'Audiovisual': median_rt[3]
-                        }
+                # Median RT per participant and modality in one grouped pass, keeping the
+                # participants (in order of appearance) that have all three modalities
+                medians = (data.groupby(['participant_number', 'modality'], sort=False)['reaction_time']
+                           .median().unstack('modality'))
+                complete = data.groupby('participant_number', sort=False)['modality'].nunique() == 3
+                medians = medians.reindex(index=complete.index[complete], columns=[1, 2, 3])
+                for participant, audio, visual, audiovisual in zip(medians.index, *medians.to_numpy().T):
+                    participants[str(participant)] = {
+                        'Audio': audio,
+                        'Visual': visual,
+                        'Audiovisual': audiovisual
+                    }
         self.store_figure_data('participant_distribution', figure_data)
 
         self.figure.tight_layout()
@@ -2604,7 +2828,10 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             return []
 
     def is_outlier(self, median_rt):
-        z_scores = np.abs(stats.zscore(median_rt))
+        # Population z-scores, as scipy.stats.zscore, without its argument handling
+        median_rt = np.asarray(median_rt, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = np.abs(median_rt - median_rt.mean()) / median_rt.std()
         return np.any(z_scores > 2)
 
     def plot_race_model(self):
@@ -2650,15 +2877,10 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             color = self.datasets[name]["color"]
 
             # Filter participants by raw violation value
-            valid, excluded = [], []
-            for p in data['participant_number'].unique():
-                sub = data[data['participant_number'] == p]
-                viol_val = self.get_participant_violation_value(sub, percentile_range)
-                if viol_val is not None:
-                    if lo_val <= viol_val <= hi_val:
-                        valid.append(p)
-                    else:
-                        excluded.append(p)
+            viol_vals = self.get_violation_values(name, percentile_range, filtered=False).dropna()
+            in_range = (viol_vals >= lo_val) & (viol_vals <= hi_val)
+            valid = viol_vals.index[in_range].tolist()
+            excluded = viol_vals.index[~in_range].tolist()
             # Track and apply exclusions
             self.excluded_participants[name] = excluded
             data = data[data['participant_number'].isin(valid)]
@@ -2803,17 +3025,10 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                 
             # Filter participants by violation value
             parts = data['participant_number'].unique()
-            valid = []
-            excluded_by_violation = []  # Track excluded participants for this dataset
-            
-            for p in parts:
-                sub = data[data['participant_number']==p]
-                viol_val = self.get_participant_violation_value(sub, percentile_range)
-                if viol_val is not None:
-                    if lo_val <= viol_val <= hi_val:
-                        valid.append(p)
-                    else:
-                        excluded_by_violation.append(p)  # Track which participants were excluded
+            viol_vals = self.get_violation_values(name, percentile_range).dropna()
+            in_range = (viol_vals >= lo_val) & (viol_vals <= hi_val)
+            valid = viol_vals.index[in_range].tolist()
+            excluded_by_violation = viol_vals.index[~in_range].tolist()  # Track which participants were excluded
             
             excluded = len(parts) - len(valid)
             total_excluded += excluded
@@ -2822,18 +3037,12 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             data = data[data['participant_number'].isin(valid)]
                 
             # Handle non-violators filtering
-            nonviolator_excluded = []  # Track participants excluded for having no violations
             if self.exclude_nonviolators_checkbox.isChecked():
                 parts = data['participant_number'].unique()
-                valid_nonzero = []
-                for p in parts:
-                    sub = data[data['participant_number']==p]
-                    res = self.calculate_race_violation(sub, percentile_range,
-                                                        self.per_participant_checkbox.isChecked())
-                    if res and res[0] > 0:
-                        valid_nonzero.append(p)
-                    else:
-                        nonviolator_excluded.append(p)
+                mean_viols = self.calculate_participant_violations(data, percentile_range,
+                                                                   self.per_participant_checkbox.isChecked())
+                is_violator = mean_viols > 0
+                valid_nonzero = list(parts[is_violator])
                         
                 excluded += len(parts) - len(valid_nonzero)
                 data = data[data['participant_number'].isin(valid_nonzero)]
@@ -2881,7 +3090,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             if self.use_percentiles_checkbox.isChecked():
                 av_data = data[data['modality'] == 3]['reaction_time'].values
                 if len(av_data) > 0:
-                    x_axis = np.array([scipy.stats.percentileofscore(av_data, rt) for rt in common_rts])
+                    x_axis = percentile_ranks(av_data, common_rts)
                     xlabel = 'Percentile'
                 else:
                     x_axis = common_rts
@@ -2978,7 +3187,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
 
         if self.use_percentiles_checkbox.isChecked():
             av_data = data[data['modality'] == 3]['reaction_time']
-            x_axis = np.array([stats.percentileofscore(av_data, rt) for rt in common_rts])
+            x_axis = percentile_ranks(av_data, common_rts)
             xlabel = 'Percentile'
         else:
             x_axis = common_rts
@@ -3019,27 +3228,27 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         """Compare violations between datasets statistically"""
         stats_text = ""
         datasets = list(violations_dict.keys())
-        
-        for i in range(len(datasets)):
-            for j in range(i + 1, len(datasets)):
-                name1, name2 = datasets[i], datasets[j]
-                v1, v2 = violations_dict[name1], violations_dict[name2]
-                
-                if self.ttest_radio.isChecked():
-                    t_stat, p_val = ttest_ind(v1, v2)
-                    stats_text += (f"{name1} vs {name2}:\n"
-                                 f"t = {t_stat:.2f}, p = {p_val:.4f}\n")
-                    if p_val < 0.05:
-                        mean_diff = np.mean(v1) - np.mean(v2)
-                        stats_text += f"Mean difference: {mean_diff:.3f}\n"
-                else:
-                    t_stat, _ = ttest_ind(v1, v2)
-                    bf10 = bayesfactor_ttest(t=t_stat, nx=len(v1), ny=len(v2))
-                    stats_text += (f"{name1} vs {name2}:\n"
-                                 f"BF₁₀ = {bf10:.2f}\n"
-                                 f"{self.interpret_bayes_factor(bf10)}\n")
-                stats_text += "\n"
-                
+        pairs = [(i, j) for i in range(len(datasets)) for j in range(i + 1, len(datasets))]
+        samples = [violations_dict[name] for name in datasets]
+        t_stats, p_vals = ttest_pairs(samples, pairs)
+        bf10s = bayes_factor_pairs(samples, pairs, t_stats)
+        
+        for (i, j), t_stat, p_val, bf10 in zip(pairs, t_stats, p_vals, bf10s):
+            name1, name2 = datasets[i], datasets[j]
+            v1, v2 = violations_dict[name1], violations_dict[name2]
+            
+            if self.ttest_radio.isChecked():
+                stats_text += (f"{name1} vs {name2}:\n"
+                             f"t = {t_stat:.2f}, p = {p_val:.4f}\n")
+                if p_val < 0.05:
+                    mean_diff = np.mean(v1) - np.mean(v2)
+                    stats_text += f"Mean difference: {mean_diff:.3f}\n"
+            else:
+                stats_text += (f"{name1} vs {name2}:\n"
+                             f"BF₁₀ = {bf10:.2f}\n"
+                             f"{self.interpret_bayes_factor(bf10)}\n")
+            stats_text += "\n"
+            
         return stats_text
 
     def calculate_race_violation(self, participant_data, percentile_range, per_participant=True):
@@ -3064,59 +3273,35 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         tuple
             (mean_violation, common_rts, ecdf_a, ecdf_v, ecdf_av, race_model)
         """
+        rts = participant_data['reaction_time'].to_numpy(dtype=np.float64)
+        modalities = participant_data['modality'].to_numpy()
+
         if per_participant:
             # Calculate per participant and average
-            participants = participant_data['participant_number'].unique()
-            
+            if rts.size == 0:
+                return None
+
             # Define common RT grid for all participants
-            all_rt = participant_data['reaction_time']
-            if all_rt.empty:
+            common_rts = np.linspace(np.nanmin(rts), np.nanmax(rts), 500)
+
+            # ECDFs of every participant and modality in one compiled pass
+            participant_idx, participants = pd.factorize(participant_data['participant_number'])
+            ecdfs, counts = modality_ecdfs(rts, modalities, participant_idx, len(participants),
+                                           common_rts[np.newaxis, :])
+
+            # Skip participants with missing modalities or insufficient data
+            valid = (counts >= 2).all(axis=0)
+            if not valid.any():
                 return None
-            global_min = all_rt.min()
-            global_max = all_rt.max()
-            common_rts = np.linspace(global_min, global_max, 500)
-            
-            # Storage for individual and average results
-            all_ecdf_a = []
-            all_ecdf_v = []
-            all_ecdf_av = []
-            all_race_model = []
-            all_violations = []
-            valid_participant_count = 0
-            
-            for participant in participants:
-                # Get data for this participant
-                p_data = participant_data[participant_data['participant_number'] == participant]
-                
-                # Check if this participant has all modalities
-                rt_a = p_data[p_data['modality'] == 1]['reaction_time']
-                rt_v = p_data[p_data['modality'] == 2]['reaction_time']
-                rt_av = p_data[p_data['modality'] == 3]['reaction_time']
-                
-                # Skip participants with missing modalities or insufficient data
-                if rt_a.empty or rt_v.empty or rt_av.empty or len(rt_a) < 2 or len(rt_v) < 2 or len(rt_av) < 2:
-                    continue
-                    
-                # Calculate individual ECDFs
-                ecdf_a = np.interp(common_rts, np.sort(rt_a), np.arange(1, len(rt_a) + 1) / len(rt_a))
-                ecdf_v = np.interp(common_rts, np.sort(rt_v), np.arange(1, len(rt_v) + 1) / len(rt_v))
-                ecdf_av = np.interp(common_rts, np.sort(rt_av), np.arange(1, len(rt_av) + 1) / len(rt_av))
-                
-                # Calculate race model based on selected model type
-                race_model = self._calculate_race_model(ecdf_a, ecdf_v, common_rts)
-                
-                if race_model is not None:
-                    valid_participant_count += 1
-                    all_ecdf_a.append(ecdf_a)
-                    all_ecdf_v.append(ecdf_v)
-                    all_ecdf_av.append(ecdf_av)
-                    all_race_model.append(race_model)
-                    all_violations.append(np.maximum(ecdf_av - race_model, 0))
-            
-            # If no valid participants, return None
-            if valid_participant_count == 0:
+            all_ecdf_a, all_ecdf_v, all_ecdf_av = ecdfs[:, valid]
+
+            # Calculate race model based on selected model type
+            race_model = self._calculate_race_model(all_ecdf_a, all_ecdf_v, common_rts)
+            if race_model is None:
                 return None
-            
+            all_race_model = np.broadcast_to(race_model, all_ecdf_av.shape)
+            all_violations = np.maximum(all_ecdf_av - all_race_model, 0)
+
             # Average across participants
             ecdf_a = np.mean(all_ecdf_a, axis=0)
             ecdf_v = np.mean(all_ecdf_v, axis=0)
@@ -3126,33 +3311,29 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             
         else:
             # Original pooled calculation method
-            rt_a = participant_data[participant_data['modality'] == 1]['reaction_time']
-            rt_v = participant_data[participant_data['modality'] == 2]['reaction_time']
-            rt_av = participant_data[participant_data['modality'] == 3]['reaction_time']
+            rt_a = rts[modalities == 1]
+            rt_v = rts[modalities == 2]
+            rt_av = rts[modalities == 3]
     
             # Check if any modality is empty
-            if rt_a.empty or rt_v.empty or rt_av.empty:
+            if rt_a.size == 0 or rt_v.size == 0 or rt_av.size == 0:
                 return None  # Cannot calculate without all three modalities
     
             # Check for NaNs or identical min/max
-            if pd.isna(rt_a.min()) or pd.isna(rt_v.min()) or pd.isna(rt_av.min()):
+            if np.isnan(np.nanmin(rt_a)) or np.isnan(np.nanmin(rt_v)) or np.isnan(np.nanmin(rt_av)):
                 return None
-            min_val = min(rt_a.min(), rt_v.min(), rt_av.min())
-            max_val = max(rt_a.max(), rt_v.max(), rt_av.max())
+            min_val = min(np.nanmin(rt_a), np.nanmin(rt_v), np.nanmin(rt_av))
+            max_val = max(np.nanmax(rt_a), np.nanmax(rt_v), np.nanmax(rt_av))
             if min_val == max_val:
                 return None  # no variability
     
             # Create common reaction time points for interpolation
             common_rts = np.linspace(min_val, max_val, 500)
     
-            # Double-check lengths before interpolation
-            if len(rt_a) == 0 or len(rt_v) == 0 or len(rt_av) == 0:
-                return None
-    
             # Calculate empirical cumulative distribution functions (ECDFs)
-            ecdf_a = np.interp(common_rts, np.sort(rt_a), np.arange(1, len(rt_a) + 1) / len(rt_a))
-            ecdf_v = np.interp(common_rts, np.sort(rt_v), np.arange(1, len(rt_v) + 1) / len(rt_v))
-            ecdf_av = np.interp(common_rts, np.sort(rt_av), np.arange(1, len(rt_av) + 1) / len(rt_av))
+            ecdfs, _ = modality_ecdfs(rts, modalities, np.zeros(rts.size, dtype=np.int64), 1,
+                                      common_rts[np.newaxis, :])
+            ecdf_a, ecdf_v, ecdf_av = ecdfs[:, 0]
             
             # Calculate race model
             race_model = self._calculate_race_model(ecdf_a, ecdf_v, common_rts)
@@ -3304,23 +3485,21 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             percentile_range = (self.percentile_range_slider.first_position, 
                                 self.percentile_range_slider.second_position)
 
-            participants = self.datasets[dataset_name]["data"]['participant_number'].unique()
-            excluded_participants = self.excluded_participants.get(dataset_name, [])
+            participant_groups = self.datasets[dataset_name]["gb"]
+            excluded_participants = set(self.excluded_participants.get(dataset_name, []))
             
             # Track participants with incomplete data
             incomplete_participants = []
 
             x_values = []
             y_values = []
-            colors = plt.cm.tab20(np.linspace(0, 1, len(participants)))
-            color_map = {participant: colors[i] for i, participant in enumerate(participants)}
+            plotted = []  # Group positions of the plotted participants, indexing into colors
+            point_labels = []
+            colors = plt.cm.tab20(np.linspace(0, 1, participant_groups.ngroups))
 
-            for participant in participants:
+            for i, (participant, participant_data) in enumerate(participant_groups):
                 if participant in excluded_participants:
                     continue
-                participant_data = self.datasets[dataset_name]["data"][
-                    self.datasets[dataset_name]["data"]['participant_number'] == participant
-                ]
 
                 x_value = self.get_factor_value(participant_data, factor1, percentile_range)
                 y_value = self.get_factor_value(participant_data, factor2, percentile_range)
@@ -3331,10 +3510,16 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     not (isinstance(y_value, float) and np.isnan(y_value))):
                     x_values.append(x_value)
                     y_values.append(y_value)
-                    ax.scatter(x_value, y_value, color=color_map[participant], 
-                            label=f'P{participant}', s=25)
+                    plotted.append(i)
+                    point_labels.append(f'P{participant}')
                 else:
                     incomplete_participants.append(participant)
+            # (n_points, 4) RGBA rows, which Matplotlib uses without converting each colour
+            point_colors = colors[plotted]
+            
+            # One collection for all participants rather than one scatter call per point
+            if x_values:
+                ax.scatter(x_values, y_values, c=point_colors, s=25)
             
             if x_values and y_values:
                 # Update global limits
@@ -3372,8 +3557,10 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             # Remove top and right axes
             ax.spines['top'].set_visible(False)
             ax.spines['right'].set_visible(False)
-            if self.show_legend_checkbox.isChecked():
-                ax.legend(loc='best', fontsize=6)
+            if self.show_legend_checkbox.isChecked() and point_labels:
+                handles = [plt.Line2D([0], [0], marker='o', linestyle='', color=col, label=label, markersize=5)
+                           for col, label in zip(point_colors, point_labels)]
+                ax.legend(handles=handles, loc='best', fontsize=6)
 
         # Apply synced axes if checkbox is checked
         if self.sync_axes_checkbox.isChecked() and not (global_xlim[0] == float('inf') or global_ylim[0] == float('inf')):
@@ -3497,6 +3684,73 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             else:
                 return None
 
+    def participant_feature_table(self, data, features, percentile_range):
+        """
+        Evaluate get_factor_value for every participant and feature in a few grouped passes.
+        
+        Reaction time summaries come from one groupby aggregation per feature, Race Violations
+        from participant_violation_values and Age from each participant's first row, instead of
+        masking the DataFrame once per participant and feature.
+        
+        Returns:
+        --------
+        pandas.DataFrame
+            One row per participant (in order of appearance) and one column per distinct
+            feature. Values match get_factor_value, except that missing computed features
+            are NaN throughout; a custom column without a value is None.
+        """
+        participants = pd.Index(pd.unique(data['participant_number']))
+        columns = {}
+        for feat in dict.fromkeys(features):
+            if feat in MODALITY_RT_FEATURES:
+                statistic, modality = MODALITY_RT_FEATURES[feat]
+                rows = data if modality is None else data[data['modality'] == modality]
+                rts = rows['reaction_time']
+                grouped = rts.groupby(rows['participant_number'], sort=False)
+                if statistic == 'iqr':
+                    # np.percentile, as calculate_interquartile_range uses, propagates NaN
+                    values = grouped.quantile(0.75) - grouped.quantile(0.25)
+                    values[rts.isna().groupby(rows['participant_number'], sort=False).any()] = np.nan
+                else:
+                    values = grouped.agg(statistic)
+            elif feat == 'Race Violations':
+                values = self.participant_violation_values(data, percentile_range)
+            elif feat == 'Total Trials':
+                values = data.groupby('participant_number', sort=False).size().astype(float)
+            elif feat == 'Age':
+                age_column = next((c for c in ('SubjectAge', 'Age') if c in data.columns), None)
+                if age_column is None:
+                    self.statusBar().showMessage("Age column not found – skipping participant.", 5000)
+                    values = pd.Series(np.nan, index=participants)
+                else:
+                    first_rows = data.drop_duplicates('participant_number')
+                    values = pd.to_numeric(first_rows[age_column], errors='coerce')
+                    values.index = first_rows['participant_number']
+            elif feat in data.columns:
+                # Mean of the numeric values, else the first non-missing value, else None
+                grouped = data[feat].groupby(data['participant_number'], sort=False)
+                numeric = pd.to_numeric(data[feat], errors='coerce')
+                values = numeric.groupby(data['participant_number'], sort=False).mean().astype(object)
+                values = values.where(values.notna(), grouped.first())
+                values = values.where(values.notna(), None)
+            else:
+                values = pd.Series([None] * len(participants), index=participants, dtype=object)
+            columns[feat] = values.reindex(participants)
+        return pd.DataFrame(columns, index=participants)
+
+    def _feature_matrix(self, table, features):
+        """
+        Float (participants, features) array of table's feature columns, NaN where a value is not
+        numeric. A single feature is duplicated so that MDS and RDMs have two dimensions.
+        """
+        matrix = np.column_stack([table[feat].to_numpy(dtype=np.float64)
+                                  if pd.api.types.is_float_dtype(table[feat])
+                                  else table[feat].map(_as_float).to_numpy(dtype=np.float64)
+                                  for feat in features])
+        if len(features) == 1:
+            matrix = np.repeat(matrix, 2, axis=1)
+        return matrix
+
 
 
     def save_figure(self):
@@ -3727,6 +3981,27 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         # Show the dialog
         dialog.exec_()
 
+    def _reset_single_axes(self):
+        """
+        Return an empty single Axes for the next plot.
+        
+        When the figure already holds just one plain subplot (the previous plot was a
+        single-panel one), that Axes is cleared and reused instead of tearing the figure
+        down and building a new Axes with all its ticks and spines. Anything else (subplot
+        grids, colorbars, figure-level text) falls back to clearing the whole figure.
+        """
+        axes = self.figure.axes
+        if len(axes) == 1 and not self.figure.texts and not self.figure.legends:
+            ax = axes[0]
+            if ax.get_subplotspec() is not None and ax.get_subplotspec().get_geometry() == (1, 1, 0, 0):
+                ax.clear()
+                ax.set_axis_on()
+                for spine in ax.spines.values():
+                    spine.set_visible(True)
+                return ax
+        self.figure.clear()
+        return self.figure.add_subplot(111)
+
     def store_figure_data(self, plot_type, data_dict):
         """Store figure data consistently for all plot types"""
         self.figure_data[plot_type] = data_dict
@@ -3783,10 +4058,13 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             
             # Restore original data
             self.datasets[dataset_name]["data"] = self.datasets[dataset_name]["original_data"].copy()
+            self.datasets[dataset_name]["soa"] = self._build_soa_cache(self.datasets[dataset_name]["data"])
+            self.datasets[dataset_name]["gb"] = self._group_participants(self.datasets[dataset_name]["data"])
             
             # Clear exclusions for this dataset
             self.excluded_participants[dataset_name] = []
-            self.excluded_trials[dataset_name] = []
+            self.excluded_trials[dataset_name] = pd.Index([], dtype='int64')
+        self._violation_cache.clear()
         
         # Show detailed status message
         status_msg = f'Restored {total_excluded_trials} excluded trials'
@@ -3853,13 +4131,16 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         
         # Get unique participants and convert to strings for consistent handling
         all_participants = sorted(str(p) for p in data['participant_number'].unique())
+        # First row of each participant, looked up by participant string below
+        first_rows = data.drop_duplicates('participant_number')
+        first_rows = first_rows.set_index(first_rows['participant_number'].astype(str))
         
         # Identify demographic columns
         demo_cols = [col for col in data.columns if col.lower() in 
                     ['age', 'gender', 'sex', 'education', 'subjectage', 'subjectsex']]
         
         for participant in all_participants:
-            participant_data = data[data['participant_number'].astype(str) == participant].iloc[0]
+            participant_data = first_rows.loc[participant]
             checkbox_text = f"Participant {participant}"
             
             # Add demographic info if available
@@ -3969,6 +4250,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         preview_layout = QVBoxLayout(preview_group)
         preview_text = QTextEdit()
         preview_text.setReadOnly(True)
+        preview_text.setAcceptRichText(False)
         preview_text.setMaximumHeight(150)
         preview_layout.addWidget(preview_text)
         main_layout.addWidget(preview_group)
@@ -4024,25 +4306,26 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                             excluded.update(str(p) for p in data[~data[col].isin(selected_values)]['participant_number'].unique())
             
             # Update preview text
-            preview = "Exclusion Summary:\n"
-            preview += f"Total participants to exclude: {len(excluded)}\n"
-            preview += f"Remaining participants: {len(all_participants) - len(excluded)}\n\n"
+            lines = ["Exclusion Summary:",
+                     f"Total participants to exclude: {len(excluded)}",
+                     f"Remaining participants: {len(all_participants) - len(excluded)}", ""]
             
             if excluded:
-                preview += "Participants to be excluded:\n"
+                lines.append("Participants to be excluded:")
                 for participant in sorted(excluded):
-                    preview += f"Participant {participant}"
+                    line = f"Participant {participant}"
                     # Add demographic info for each participant
-                    participant_data = data[data['participant_number'].astype(str) == participant].iloc[0]
+                    participant_data = first_rows.loc[participant]
                     demo_info = []
                     for col in demo_cols:
                         if col in participant_data:
                             demo_info.append(f"{col}: {participant_data[col]}")
                     if demo_info:
-                        preview += f" ({', '.join(demo_info)})"
-                    preview += "\n"
+                        line += f" ({', '.join(demo_info)})"
+                    lines.append(line)
+                lines.append("")
             
-            preview_text.setText(preview)
+            preview_text.setPlainText("\n".join(lines))
             return excluded
         
         preview_button.clicked.connect(update_preview)
@@ -4077,7 +4360,9 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                 
                 # Create new dataset with excluded participants removed
                 new_data = data[~data['participant_number'].astype(str).isin(excluded)].copy()
-                self.datasets[new_name] = {"data": new_data, "color": self.get_next_color()}
+                self.datasets[new_name] = {"data": new_data, "color": self.get_next_color(),
+                                           "soa": self._build_soa_cache(new_data),
+                                           "gb": self._group_participants(new_data)}
                 
                 # Add new dataset to list
                 self.dataset_list.addItem(new_name)
@@ -4085,6 +4370,9 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                 # Update existing dataset
                 self.excluded_participants[dataset_name] = set(excluded)
                 self.datasets[dataset_name]["data"] = data[~data['participant_number'].astype(str).isin(excluded)].copy()
+                self.datasets[dataset_name]["soa"] = self._build_soa_cache(self.datasets[dataset_name]["data"])
+                self.datasets[dataset_name]["gb"] = self._group_participants(self.datasets[dataset_name]["data"])
+                self._violation_cache.clear()
             
             self.update_participant_selector()
             if hasattr(self, 'current_figure_type'):
@@ -4202,14 +4490,9 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                                  alpha=alpha,
                                  label=label)
                     
-                    if pattern == 'hatched':
-                        bar[0].set_hatch('///')
-                    elif pattern == 'dotted':
-                        bar[0].set_hatch('...')
-                    elif pattern == 'dashed':
-                        bar[0].set_hatch('--')
-                    elif pattern == 'cross-hatched':
-                        bar[0].set_hatch('xxx')
+                    hatch = PATTERN_HATCHES.get(pattern)
+                    if hatch:
+                        bar[0].set_hatch(hatch)
                 
                 ax.set_xticks(x)
                 ax.set_xticklabels(modality_labels, rotation=45)
@@ -4244,19 +4527,22 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     return
                 
                 try:
-                    data = pd.read_csv(file_path)
+                    data = self._compact_dtypes(pd.read_csv(file_path))
                     # Use the selected color from the colorwheel
                     color = dataset_color_dict["color"]
                     
                     pattern = pattern_selector.currentData()
                     alpha = alpha_slider.value() / 100.0
                     
+                    data = data.copy()
                     self.datasets[name] = {
-                        "data": data.copy(),
+                        "data": data,
                         "original_data": data.copy(),
                         "color": color,
                         "pattern": pattern,
-                        "alpha": alpha
+                        "alpha": alpha,
+                        "soa": self._build_soa_cache(data),
+                        "gb": self._group_participants(data)
                     }
                     
                     self.dataset_list.addItem(name)
@@ -4264,7 +4550,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
                     self.dataset_patterns[name] = pattern
                     
                     self.excluded_participants[name] = []
-                    self.excluded_trials[name] = []
+                    self.excluded_trials[name] = pd.Index([], dtype='int64')
                     
                     self.update_participant_selector()
                     self.statusBar().showMessage(f'Loaded dataset: {name}')
@@ -4318,11 +4604,14 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             color = plt.cm.tab20(len(self.datasets) % 20)
             pattern = 'solid'  # You can adjust the pattern as needed
     
+            combined_data = combined_data.copy()
             self.datasets[name] = {
-                "data": combined_data.copy(),
+                "data": combined_data,
                 "original_data": combined_data.copy(),
                 "color": color,
-                "pattern": pattern
+                "pattern": pattern,
+                "soa": self._build_soa_cache(combined_data),
+                "gb": self._group_participants(combined_data)
             }
     
             # Add to list and initialize exclusions
@@ -4330,7 +4619,7 @@ class ReactionTimeAnalysisGUI(QMainWindow):
             self.dataset_colors[name] = color
             self.dataset_patterns[name] = pattern
             self.excluded_participants[name] = []
-            self.excluded_trials[name] = []
+            self.excluded_trials[name] = pd.Index([], dtype='int64')
     
             # Update participant selector
             self.update_participant_selector()
@@ -4447,32 +4736,29 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         
         for modality, mod_name in [(1, "Audio"), (2, "Visual"), (3, "Audiovisual")]:
             stats_text += f"{mod_name} Modality:\n"
+            dataset_rts = []
+            for item in selected_items:
+                data = self.datasets[item.text()]["data"]
+                dataset_rts.append(data[data['modality'] == modality]['reaction_time'])
             
             # Compare each pair of datasets
-            for i in range(len(selected_items)):
-                for j in range(i + 1, len(selected_items)):
-                    name1 = selected_items[i].text()
-                    name2 = selected_items[j].text()
-                    
-                    data1 = self.datasets[name1]["data"]
-                    data2 = self.datasets[name2]["data"]
-                    
-                    rt1 = data1[data1['modality'] == modality]['reaction_time']
-                    rt2 = data2[data2['modality'] == modality]['reaction_time']
-                    
-                    if self.ttest_radio.isChecked():
-                        t_stat, p_val = ttest_ind(rt1, rt2)
-                        stats_text += f"{name1} vs {name2}: "
-                        stats_text += f"t = {t_stat:.2f}, p = {p_val:.4f}\n"
+            pairs = [(i, j) for i in range(len(selected_items)) for j in range(i + 1, len(selected_items))]
+            t_stats, p_vals = ttest_pairs(dataset_rts, pairs)
+            bf10s = bayes_factor_pairs(dataset_rts, pairs, t_stats)
+            for (i, j), t_stat, p_val, bf10 in zip(pairs, t_stats, p_vals, bf10s):
+                name1 = selected_items[i].text()
+                name2 = selected_items[j].text()
+                
+                if self.ttest_radio.isChecked():
+                    stats_text += f"{name1} vs {name2}: "
+                    stats_text += f"t = {t_stat:.2f}, p = {p_val:.4f}\n"
+                else:
+                    # Format BF10 to scientific notation if > 1000
+                    if abs(bf10) >= 1000:
+                        stats_text += f"{name1} vs {name2}: BF₁₀ = {bf10:.2e}\n"
                     else:
-                        t_stat, _ = ttest_ind(rt1, rt2)
-                        bf10 = bayesfactor_ttest(t=t_stat, nx=len(rt1), ny=len(rt2))
-                        # Format BF10 to scientific notation if > 1000
-                        if abs(bf10) >= 1000:
-                            stats_text += f"{name1} vs {name2}: BF₁₀ = {bf10:.2e}\n"
-                        else:
-                            stats_text += f"{name1} vs {name2}: BF₁₀ = {bf10:.2f}\n"
-            
+                        stats_text += f"{name1} vs {name2}: BF₁₀ = {bf10:.2f}\n"
+        
             stats_text += "\n"
         
         return stats_text
@@ -4485,7 +4771,8 @@ class ReactionTimeAnalysisGUI(QMainWindow):
 
     def toggle_permutation_parameters(self, state):
         """Show or hide permutation parameters based on checkbox state"""
-        self.permutation_options_widget.setVisible(state == Qt.Checked)
+        self.permutation_widget.setVisible(state == Qt.Checked or
+                                           self.model_selector.currentText() == "Permutation Test")
         
         # Update the status bar with helpful message when enabled
         if state == Qt.Checked:
@@ -4529,6 +4816,10 @@ class ReactionTimeAnalysisGUI(QMainWindow):
         return slider, label
 
 if __name__ == "__main__":
+    if "--precompile" in sys.argv[1:]:
+        # Populate the Numba kernel cache (e.g. after installing) without starting the GUI
+        print("Kernels compiled and cached." if precompile() else "Numba is not in use; nothing to compile.")
+        sys.exit(0)
     app = QApplication(sys.argv)
     ex = ReactionTimeAnalysisGUI()
     sys.exit(app.exec_())
\ No newline at end of file
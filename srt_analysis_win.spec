@@ -11,12 +11,10 @@ a = Analysis(
         'numpy',
         'scipy',
         'matplotlib',
-        'sklearn',
         'PyQt5',
         'PyQt5.QtWidgets',
         'PyQt5.QtCore',
         'PyQt5.QtGui',
-        'pingouin'
     ],
     hookspath=[],
     hooksconfig={},
@@ -27,6 +25,13 @@ a = Analysis(
         'ipython',
         'ipykernel',
         'IPython',
+        # _srt_kernels runs its NumPy fallbacks in frozen builds, so Numba is not bundled
+        'numba',
+        'llvmlite',
+        # Only used to cross-check the statistics kernels during development
+        'pingouin',
+        # No longer used now that MDS and min-max scaling are done with NumPy and SciPy
+        'sklearn',
     ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,